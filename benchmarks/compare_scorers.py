@@ -0,0 +1,63 @@
+"""Compare the hypothesis rankings and speed of the semantic scorers on the README examples.
+
+Every scorer expands the examples and each of its decisions is compared with the one made by the
+default Word Mover's Distance scorer.  Requires LanguageTool and an embedding model, for example:
+
+    $ python benchmarks/compare_scorers.py --api-key glove-twitter-25
+"""
+from __future__ import print_function, unicode_literals
+
+import argparse
+import os
+import sys
+import time
+
+# Run from a checkout without installing
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pycontractions import Contractions
+from pycontractions.scorers import scorers
+
+examples = [
+    "I'd like to know how I'd done that!",
+    "We're going to the zoo and I don't think I'll be home for dinner.",
+    "Theyre going to the zoo and she'll be home for dinner.",
+    "We ain't all the same",
+    "He's been there before and he's going back tomorrow.",
+    "It's cold outside but it's been worse, what's the forecast?",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the semantic scorers on the README examples.")
+    parser.add_argument('--api-key', help="gensim.downloader model to use")
+    parser.add_argument('--w2v-path', help="word2vec binary model to use")
+    parser.add_argument('--kv-path', help="native keyedvectors model to use")
+    parser.add_argument('--precise', action='store_true', help="use the precise method")
+    parser.add_argument('--repeat', type=int, default=5, help="number of timed runs per scorer")
+    args = parser.parse_args()
+
+    reference = Contractions(w2v_path=args.w2v_path, api_key=args.api_key, kv_path=args.kv_path)
+    reference.load_models()
+    results = {}
+    for name in sorted(scorers, key=lambda name: name != 'wmd'):
+        cont = Contractions(kv_model=reference.kv_model, scorer=name, lc_tool=reference.lc_tool)
+        start = time.time()
+        for _ in range(args.repeat):
+            decisions = list(cont.expand_texts(examples, precise=args.precise, scores=True))
+        elapsed = (time.time() - start) / args.repeat
+        texts = list(cont.expand_texts(examples, precise=args.precise))
+        results[name] = (texts, [[hyp[0][0] for hyp in text] for text in decisions], elapsed)
+
+    texts, decisions, elapsed = results['wmd']
+    total = sum(len(text) for text in decisions)
+    for name, (texts1, decisions1, elapsed1) in sorted(results.items()):
+        agree = sum(a == b for text, text1 in zip(decisions, decisions1) for a, b in zip(text, text1))
+        print("{:10} {:8.1f} ms  {}/{} decisions agree with wmd".format(name, elapsed1 * 1000, agree, total))
+        for text, text1 in zip(texts, texts1):
+            if text != text1:
+                print("    wmd: {}\n    {}: {}".format(text, name, text1))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""Offline stand-ins for the models pycontractions needs, and a deterministic benchmark corpus.
+
+vectors.txt is a small word2vec text format model of the contraction tables and the filler words
+of the corpus, with pseudo random vectors seeded by each word.  Regenerate it with:
+
+    $ python benchmarks/fixtures.py
+"""
+from __future__ import print_function, unicode_literals
+
+import io
+import os
+import random
+import re
+import zlib
+
+import numpy as np
+
+VECTORS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'vectors.txt')
+VECTOR_SIZE = 16
+
+FILLER = ("the a an and or but so if then when where while because about above after again against all also "
+          "always any around at away back before below between both by day down each early even every far few "
+          "first for from good great here home how in into just last late later long many more most much near "
+          "never new next night no not now of off often old on once only other our out over own place right same "
+          "small some still such than that their them there these they thing this those through time to today "
+          "tomorrow too under until up very way we week well what which who why with without work world year yet "
+          "you zoo dinner movie review story actor scene plot ending music friend city car road house school "
+          "book water food game team money family morning weather forecast ticket store line call plan").split()
+
+# Contractions the corpus is seeded with, simple ones as well as ones expanded by context
+CONTRACTIONS = ("can't don't didn't won't isn't wasn't couldn't shouldn't wouldn't haven't I'm I've I'll you're "
+                "we're they're they've gonna dunno 'cause it's he's she's what's who's there's that's I'd he'd "
+                "you'd we'll they'll ain't aren't y'all theyre youre").split()
+
+# Expansions the corpus for contract_texts is seeded with
+EXPANSIONS = ["are not", "cannot", "could have", "could not", "did not", "do not", "does not", "had not",
+              "has not", "have not", "he is", "I am", "I would", "I have", "is not", "it is", "it will",
+              "let us", "she is", "that is", "there is", "they are", "they have", "was not", "we are",
+              "we will", "were not", "what is", "will not", "would not", "you are", "you will"]
+
+
+def _checksum(text):
+    """Return an unsigned CRC-32 of text, the same across Python versions."""
+    return zlib.crc32(text.encode('utf-8')) & 0xffffffff
+
+
+class Match(object):
+    """A grammar error at offset, counted in UTF-16 code units like LanguageTool does."""
+
+    def __init__(self, offset):
+        self.offset = offset
+
+
+class StubLanguageTool(object):
+    """Deterministic replacement for language_check.LanguageTool.
+
+    Each pair of adjacent words within a paragraph is an error if the checksum of the pair is
+    divisible by rate, so the same text always has the same errors and the hypotheses of a
+    contraction get different counts, without starting Java.
+    """
+
+    def __init__(self, rate=5):
+        self.rate = rate
+
+    def check(self, text):
+        matches = []
+        position = 0
+        for paragraph in text.split("\n\n"):
+            words = [(m.start(), m.group().lower()) for m in re.finditer(r"\S+", paragraph, re.U)]
+            for (start, word1), (_, word2) in zip(words, words[1:]):
+                if _checksum(word1 + " " + word2) % self.rate == 0:
+                    matches.append(Match(position + len(paragraph[:start].encode('utf-16-le')) // 2))
+            position += len(paragraph.encode('utf-16-le')) // 2 + 2
+        return matches
+
+
+def corpus(docs, length, density, seed=0, phrases=CONTRACTIONS):
+    """Return docs texts of length tokens, of which a density fraction are drawn from phrases.
+
+    Every twelfth token ends a sentence.  The same arguments always return the same texts.
+    """
+    rng = random.Random(_checksum("{}-{}-{}-{}".format(docs, length, density, seed)))
+    texts = []
+    for _ in range(docs):
+        tokens = [rng.choice(FILLER) for _ in range(length)]
+        for i in rng.sample(range(length), int(round(length * density))):
+            tokens[i] = rng.choice(phrases)
+        for i in range(11, length, 12):
+            tokens[i] += "."
+        texts.append(" ".join(tokens))
+    return texts
+
+
+def write_vectors(path=VECTORS_PATH, size=VECTOR_SIZE):
+    """Write the fixture model in word2vec text format, seeding each word's vector with its checksum."""
+    from pycontractions.models import table_vocabulary
+
+    words = sorted(set(FILLER) | set(CONTRACTIONS) | table_vocabulary())
+    with io.open(path, 'w', encoding='utf-8') as f:
+        f.write("{} {}\n".format(len(words), size))
+        for word in words:
+            vector = np.random.RandomState(_checksum(word)).standard_normal(size)
+            f.write("{} {}\n".format(word, " ".join("{:.4f}".format(x) for x in vector)))
+    return len(words)
+
+
+if __name__ == '__main__':
+    print("Wrote {} words to {}".format(write_vectors(), VECTORS_PATH))
@@ -0,0 +1,162 @@
+"""Time the hot paths of pycontractions offline and write the results as JSON.
+
+expand_texts (fast and precise) and contract_texts are timed on generated documents across
+lengths and contraction densities, and load_models on the bundled fixture model in word2vec and
+native format.  The fixture model and StubLanguageTool of fixtures.py replace the downloaded
+embeddings and Java LanguageTool, so the numbers measure pycontractions itself and are
+comparable between releases on the same machine:
+
+    $ python benchmarks/run_benchmarks.py --output before.json
+    $ python benchmarks/run_benchmarks.py --output after.json --baseline before.json
+"""
+from __future__ import division, print_function, unicode_literals
+
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+# Run from a checkout without installing, the benchmarks directory is already on the path for fixtures
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gensim
+from gensim.models import KeyedVectors
+import numpy as np
+
+from fixtures import EXPANSIONS, VECTORS_PATH, StubLanguageTool, corpus
+from pycontractions import Contractions
+
+
+def timed(func, repeat):
+    """Return the wall clock time of each of repeat calls to func, after one untimed call to warm up."""
+    func()
+    times = []
+    for _ in range(repeat):
+        start = time.time()
+        func()
+        times.append(time.time() - start)
+    return times
+
+
+def result(name, times, docs=None, tokens=None, **params):
+    """Return the JSON record of a benchmark, with throughput based on its best time."""
+    best = min(times)
+    record = dict(params, name=name, times=times, best=best, median=sorted(times)[len(times) // 2])
+    if docs is not None:
+        record.update(docs=docs, tokens=tokens, docs_per_s=docs / best, tokens_per_s=tokens / best)
+    return record
+
+
+def bench_texts(kv_model, lc_tool, args):
+    """Time expand_texts and contract_texts across document lengths and contraction densities."""
+    results = []
+    cont = Contractions(kv_model=kv_model, lc_tool=lc_tool, scorer=args.scorer, beam_width=args.beam_width)
+    for length in args.lengths:
+        docs = max(1, args.tokens // length)
+        for density in args.densities:
+            texts = corpus(docs, length, density, seed=args.seed)
+            phrases = corpus(docs, length, density, seed=args.seed, phrases=EXPANSIONS)
+            tokens = sum(len(text.split()) for text in texts)
+            params = {'length': length, 'density': density}
+            for precise in (False, True):
+                times = timed(lambda: list(cont.expand_texts(texts, precise=precise, window=args.window,
+                                                             batch_size=args.batch_size)), args.repeat)
+                results.append(result('expand_texts', times, docs, tokens, precise=precise, window=args.window,
+                                      batch_size=args.batch_size, **params))
+            times = timed(lambda: list(cont.contract_texts(phrases)), args.repeat)
+            results.append(result('contract_texts', times, docs, sum(len(text.split()) for text in phrases),
+                                  **params))
+            if args.verbose:
+                print("length {} density {} done".format(length, density), file=sys.stderr)
+    return results
+
+
+def bench_load(lc_tool, args):
+    """Time load_models on the fixture model in word2vec binary and native keyedvectors format."""
+    results = []
+    directory = tempfile.mkdtemp(prefix='pycontractions-bench-')
+    try:
+        model = KeyedVectors.load_word2vec_format(VECTORS_PATH, binary=False)
+        w2v_path = os.path.join(directory, 'vectors.bin')
+        kv_path = os.path.join(directory, 'vectors.kv')
+        model.save_word2vec_format(w2v_path, binary=True)
+        model.save(kv_path, sep_limit=0)
+        for fmt, options in (('word2vec', {'w2v_path': w2v_path}), ('keyedvectors', {'kv_path': kv_path})):
+            times = timed(lambda: Contractions(lc_tool=lc_tool, **options).load_models(), args.repeat)
+            results.append(result('load_models', times, format=fmt))
+    finally:
+        shutil.rmtree(directory)
+    return results
+
+
+def compare(results, baseline):
+    """Print the change of each benchmark's best time against a previous run."""
+    def key(record):
+        return tuple(sorted((k, v) for k, v in record.items() if k not in (
+            'times', 'best', 'median', 'docs', 'tokens', 'docs_per_s', 'tokens_per_s')))
+
+    previous = dict((key(record), record['best']) for record in baseline['results'])
+    for record in results:
+        before = previous.get(key(record))
+        if before is None:
+            continue
+        params = ", ".join("{}={}".format(k, v) for k, v in key(record) if k != 'name')
+        print("{:15} {:70} {:9.2f} ms {:9.2f} ms  {:+6.1f}%".format(
+            record['name'], params, before * 1000, record['best'] * 1000, (record['best'] / before - 1) * 100))
+
+
+def _window(value):
+    return value if value == 'sentence' else int(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pycontractions with offline stub models.")
+    parser.add_argument('--output', help="file to write the JSON results to, stdout if omitted")
+    parser.add_argument('--baseline', help="JSON results of an earlier run to compare against")
+    parser.add_argument('--lengths', type=int, nargs='+', default=[10, 100, 1000], help="tokens per document")
+    parser.add_argument('--densities', type=float, nargs='+', default=[0.0, 0.02, 0.1],
+                        help="fraction of tokens that are contractions")
+    parser.add_argument('--tokens', type=int, default=2000, help="tokens per timed run of each case")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs of each case")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the generated documents")
+    parser.add_argument('--window', type=_window, help="scoring window passed to expand_texts")
+    parser.add_argument('--batch-size', type=int, default=1, help="batch size passed to expand_texts")
+    parser.add_argument('--scorer', default='wmd', help="semantic scorer")
+    parser.add_argument('--beam-width', type=int, default=3, help="beam width of the precise method")
+    parser.add_argument('--verbose', action='store_true', help="report progress on stderr")
+    args = parser.parse_args()
+
+    lc_tool = StubLanguageTool()
+    kv_model = KeyedVectors.load_word2vec_format(VECTORS_PATH, binary=False)
+    results = bench_load(lc_tool, args) + bench_texts(kv_model, lc_tool, args)
+    report = {
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+            'gensim': gensim.__version__,
+            'numpy': np.__version__,
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'options': dict((k, v) for k, v in vars(args).items() if k not in ('output', 'baseline', 'verbose')),
+        'results': results,
+    }
+
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.output is None:
+        print(output)
+    else:
+        with io.open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    if args.baseline is not None:
+        with io.open(args.baseline, encoding='utf-8') as f:
+            compare(results, json.loads(f.read()))
+
+
+if __name__ == '__main__':
+    main()
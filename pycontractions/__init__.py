@@ -1 +1,18 @@
-from .contractions import Contractions
+import sys
+
+from .contractions import Contractions, apply_edits
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        # Importing asyncio takes longer than the rest of the package, so only do it when asked for
+        if name == 'AsyncContractions':
+            from .aio import AsyncContractions
+            globals()[name] = AsyncContractions
+            return AsyncContractions
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+else:
+    try:
+        from .aio import AsyncContractions
+    except SyntaxError:
+        # Python 2 has no asyncio syntax
+        pass
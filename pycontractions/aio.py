@@ -0,0 +1,211 @@
+"""Asyncio interface for expanding contractions, requires Python 3.6+."""
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import http.client
+import json
+import threading
+from timeit import default_timer
+from urllib.parse import urlencode, urlsplit
+
+from .contractions import (Contractions, _CROSS_PARAGRAPH_RULES, _check_window, _count_errors, _error_offsets,
+                           _has_candidates, _join_paragraphs)
+from .instrumentation import null_timer
+
+
+async def _aiterate(texts):
+    """Iterate over an async iterable or a plain iterable of texts."""
+    if hasattr(texts, '__aiter__'):
+        async for text in texts:
+            yield text
+    else:
+        for text in texts:
+            yield text
+
+
+class AsyncContractions(Contractions):
+    """Contractions with an asyncio counterpart to expand_texts.
+
+    Grammar checks of many documents are kept in flight at once, either against a LanguageTool
+    HTTP server or the server started by language_check, over a bounded pool of connections.
+    Scoring is run in an executor so the event loop is never blocked.  Call close, or use it as
+    an async context manager, to shut the connection pool down.
+    """
+
+    def __init__(self, *args, lt_url=None, max_connections=8, executor=None, **kwargs):
+        """Takes the arguments of Contractions along with:
+
+        lt_url is the root URL of a LanguageTool HTTP server, such as 'http://localhost:8081'.  If it
+        is None the server started by language_check is used.  max_connections is the number of
+        requests sent to LanguageTool at once.  executor is the concurrent.futures executor scoring
+        runs in, the event loop's default executor if None.
+        """
+        super(AsyncContractions, self).__init__(*args, **kwargs)
+        self.lt_url = lt_url
+        self.max_connections = max_connections
+        self.executor = executor
+        self._connections = None
+        self._local = threading.local()
+        # The lock guarding load_models and the event loop it was made in
+        self._load_lock = (None, None)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Shut down the connection pool and worker processes, which are restarted if the object is used again."""
+        super(AsyncContractions, self).close()
+        if self._connections is not None:
+            self._connections.shutdown()
+            self._connections = None
+
+    def _http_check(self, text):
+        """Return the offsets of the errors the LanguageTool HTTP server finds in text.
+
+        The rules that look across paragraphs are disabled.  Runs in a connection thread, each of
+        which keeps its own connection alive between requests.
+        """
+        url = urlsplit(self.lt_url)
+        body = urlencode({'language': self.lang_code, 'text': text,
+                          'disabledRules': ",".join(_CROSS_PARAGRAPH_RULES)}).encode('ascii')
+        headers = {'Content-Type': 'application/x-www-form-urlencoded', 'Accept': 'application/json'}
+        for attempt in range(2):
+            connection = getattr(self._local, 'connection', None)
+            if connection is None:
+                connection = http.client.HTTPConnection(url.hostname, url.port or 80)
+                self._local.connection = connection
+            try:
+                connection.request('POST', url.path.rstrip('/') + '/v2/check', body, headers)
+                response = connection.getresponse()
+                data = response.read()
+                break
+            except (http.client.HTTPException, OSError):
+                # The server may have closed an idle connection, retry once on a new one
+                connection.close()
+                self._local.connection = None
+                if attempt:
+                    raise
+        if response.status != 200:
+            raise IOError("LanguageTool returned {} {}".format(response.status, data[:200]))
+        return [match['offset'] for match in json.loads(data.decode('utf-8'))['matches']]
+
+    def _tool_check(self, text):
+        """Return the offsets of the errors language_check finds in text."""
+        return _error_offsets(self.lc_tool.check(text))
+
+    async def _aload_models(self):
+        """Load whatever models are still missing in the executor, once."""
+        # Locks are bound to the event loop they are made in before Python 3.10, so each loop gets its own
+        loop = asyncio.get_event_loop()
+        if self._load_lock[0] is not loop:
+            self._load_lock = (loop, asyncio.Lock())
+        async with self._load_lock[1]:
+            if self.lt_url is None and self.lc_tool is None:
+                await loop.run_in_executor(self.executor, self.load_models)
+            elif self.kv_model is None:
+                await loop.run_in_executor(self.executor, self._load_kv_model)
+
+    async def _agrammar_errors(self, texts):
+        """Return the number of grammar errors in each text using a single LanguageTool request."""
+        document, starts, ends = _join_paragraphs(texts)
+        check = self._tool_check if self.lt_url is None else self._http_check
+        if self._connections is None:
+            self._connections = ThreadPoolExecutor(self.max_connections)
+        offsets = await asyncio.get_event_loop().run_in_executor(self._connections, check, document)
+        return _count_errors(offsets, starts, ends)
+
+    async def _atimed(self, stage, awaitable, record):
+        """Await awaitable, adding the time it took to the timer of stage and to record unless it is None."""
+        if record is None:
+            return await awaitable
+        start = default_timer()
+        try:
+            return await awaitable
+        finally:
+            elapsed = default_timer() - start
+            self.instrumentation.timers[stage] += elapsed
+            record[stage] += elapsed
+
+    async def _ascore_pairs(self, pairs, record=None):
+        """Return the distance and number of grammar errors for each (source, hypothesis) pair.
+
+        The grammar check and the semantic scoring of the pairs missing from the cache run concurrently.
+        record is the instrumentation record of the document the pairs belong to, if instrumenting.
+        """
+        keys, scored, missing = self._lookup_scores(pairs)
+        timer = null_timer
+        if self.instrumentation is not None:
+            timer = self.instrumentation.timer
+            self.instrumentation.count(cache_hits=len(scored), scored=len(missing), grammar_calls=int(bool(missing)))
+        if missing:
+            with timer('load'):
+                await self._aload_models()
+            hypotheses = sorted(set(text1 for _, text1 in missing.values()))
+            counts, distances = await asyncio.gather(
+                self._atimed('grammar', self._agrammar_errors(hypotheses), record),
+                self._atimed('semantic', asyncio.get_event_loop().run_in_executor(
+                    self.executor, self._semantic_distances, missing), record))
+            self._store_scores(scored, missing, distances, dict(zip(hypotheses, counts)))
+        return [scored[key] for key in keys]
+
+    async def _aexpand_text(self, text, precise, scores, window):
+        """Expand one text, returning its (text, intermediates, edits) tuple and its instrumentation record.
+
+        The record is None unless instrumenting.  The grammar and semantic time of a record are the
+        time its own scoring took, which overlaps with that of the other documents in flight.
+        """
+        stats = self.instrumentation
+        record = stats.document(text) if stats is not None else None
+        if not _has_candidates(text):
+            return (text, [], []), record
+        if precise:
+            steps = self._expand_text_precise(text, scores, window)
+        else:
+            steps = self._expand_text(text, scores, window)
+        request = next(steps) if stats is None else stats.step(record, steps, None)
+        while not isinstance(request, tuple):
+            scored = await self._ascore_pairs(request, record)
+            request = steps.send(scored) if stats is None else stats.step(record, steps, scored)
+        if stats is not None:
+            # There is an edit for every contraction found
+            record['matches'] = len(request[2])
+        return request, record
+
+    def _finish(self, expanded, scores, edits):
+        """Report the record of an expanded text and return what aexpand_texts yields for it."""
+        result, record = expanded
+        if record is not None:
+            self.instrumentation.finish(record)
+        return self._result(result, scores, edits)
+
+    @staticmethod
+    def _result(result, scores, edits):
+        """Return what aexpand_texts yields for a (text, intermediates, edits) tuple."""
+        text, intermediates, text_edits = result
+        if edits:
+            return text_edits
+        return intermediates if scores else text
+
+    async def aexpand_texts(self, texts, precise=False, scores=False, window=None, concurrency=16, edits=False):
+        """Return an async generator over an iterable or async iterable of text with common contractions expanded.
+
+        Takes the same options as expand_texts.  Up to concurrency documents are expanded at once
+        and results are yielded in the order of texts, as are instrumentation records.
+        """
+        _check_window(window)
+        self._check_cache_window(window)
+
+        pending = deque()
+        try:
+            async for text in _aiterate(texts):
+                pending.append(asyncio.ensure_future(self._aexpand_text(text, precise, scores, window)))
+                if len(pending) >= concurrency:
+                    yield self._finish(await pending.popleft(), scores, edits)
+            while pending:
+                yield self._finish(await pending.popleft(), scores, edits)
+        finally:
+            for task in pending:
+                task.cancel()
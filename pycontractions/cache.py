@@ -0,0 +1,78 @@
+from __future__ import unicode_literals
+
+from collections import OrderedDict
+import io
+import json
+
+
+class ScoreCache(object):
+    """Bounded least recently used cache of hypothesis scores.
+
+    Keys are (source, hypothesis) pairs of normalized scoring contexts and values are
+    (distance, grammar errors) tuples.  Hits and misses are counted for monitoring.
+    """
+
+    def __init__(self, max_size=10000):
+        """max_size is the number of entries kept before the least recently used ones are evicted."""
+        if max_size < 1:
+            raise AttributeError("Cache size must be at least 1")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return the cached score for key or None, marking it as most recently used."""
+        try:
+            value = self._entries.pop(key)
+        except KeyError:
+            self.misses += 1
+            return None
+        self._entries[key] = value
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Store a score for key, evicting the least recently used entries over max_size."""
+        self._entries.pop(key, None)
+        self._entries[key] = value
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def stats(self):
+        """Return a dict of the hit and miss counts along with the current and maximum size."""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries), 'max_size': self.max_size}
+
+    def clear(self):
+        """Remove all entries and reset the statistics."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def save(self, path, setup=None):
+        """Write the entries to a JSON file at path, least recently used first.
+
+        setup is a dict describing how the scores were computed, such as the scorer and model,
+        which load checks.
+        """
+        entries = [[source, hypothesis, distance, errors]
+                   for (source, hypothesis), (distance, errors) in self._entries.items()]
+        with io.open(path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'setup': setup, 'entries': entries}, ensure_ascii=False, sort_keys=True))
+
+    def load(self, path, setup=None):
+        """Add the entries of a JSON file written by save, keeping at most max_size of them.
+
+        If setup is given it must equal the setup the file was saved with.
+        """
+        with io.open(path, encoding='utf-8') as f:
+            data = json.loads(f.read())
+        # Files of earlier versions are a bare list of entries without a setup
+        saved, entries = (data['setup'], data['entries']) if isinstance(data, dict) else (None, data)
+        if setup is not None and saved != setup:
+            raise AttributeError("Score cache {} was saved with {} rather than {}".format(path, saved, setup))
+        for source, hypothesis, distance, errors in entries:
+            self.put((source, hypothesis), (distance, errors))
@@ -0,0 +1,139 @@
+from __future__ import division, print_function, unicode_literals
+
+import argparse
+from collections import deque
+from .contractions import Contractions
+import io
+import json
+import sys
+import time
+
+
+class _Progress(object):
+    """Count documents and tokens and periodically report throughput to stderr."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.docs = 0
+        self.tokens = 0
+        self.start = self.last = time.time()
+
+    def update(self, text):
+        self.docs += 1
+        self.tokens += len(text.split())
+        if self.interval > 0:
+            now = time.time()
+            if now - self.last >= self.interval:
+                self.last = now
+                self.report()
+
+    def report(self):
+        elapsed = max(time.time() - self.start, 1e-9)
+        print("{} docs, {:.1f} docs/s, {:.1f} tokens/s".format(
+            self.docs, self.docs / elapsed, self.tokens / elapsed), file=sys.stderr)
+
+
+def _window(value):
+    """Parse the --window argument."""
+    return value if value == 'sentence' else int(value)
+
+
+def _parser():
+    parser = argparse.ArgumentParser(
+        prog='pycontractions', description="Expand or create contractions in a stream of texts.  Reads one text per "
+                                           "line, or one JSON object per line with --jsonl, and writes the results "
+                                           "to stdout in the same format, keeping blank lines.")
+    parser.add_argument('mode', choices=['expand', 'contract'])
+    parser.add_argument('input', nargs='?', default='-', help="input file, stdin if omitted or -")
+    parser.add_argument('--jsonl', action='store_true', help="input and output are JSON lines")
+    parser.add_argument('--field', default='text', help="field holding the text in each JSON line (default: text)")
+    parser.add_argument('--precise', action='store_true', help="use the slower but more precise expansion")
+    parser.add_argument('--window', type=_window, help="score contractions on their 'sentence' or this many tokens")
+    parser.add_argument('--batch-size', type=int, default=64, help="texts grammar checked together (default: 64)")
+    parser.add_argument('--workers', type=int, default=1, help="worker processes (default: 1)")
+    parser.add_argument('--chunksize', type=int, default=64, help="texts sent to a worker at once (default: 64)")
+    parser.add_argument('--progress', type=float, default=10, metavar='SECONDS',
+                        help="report throughput every SECONDS to stderr, 0 to disable (default: 10)")
+    models = parser.add_argument_group('models')
+    models.add_argument('--w2v-path', help="word2vec binary model")
+    models.add_argument('--kv-path', help="native keyedvectors model, memory mapped")
+    models.add_argument('--api-key', help="gensim.downloader model")
+    models.add_argument('--lang', default='en-US', help="LanguageTool language code (default: en-US)")
+    models.add_argument('--scorer', default='wmd', help="semantic scorer: wmd, rwmd or centroid (default: wmd)")
+    models.add_argument('--beam-width', type=int, default=3, help="beam width of the precise method (default: 3)")
+    models.add_argument('--cache-size', type=int, default=0, help="number of hypothesis scores to cache")
+    models.add_argument('--cache-path', help="file to load the score cache from and save it to")
+    models.add_argument('--context-index', help="context index to consult before scoring")
+    return parser
+
+
+def main(argv=None):
+    """Stream texts from a file or stdin through expand_texts or contract_texts to stdout.
+
+    In --jsonl mode blank lines are passed through as blank lines, so output lines match input lines.
+    """
+    parser = _parser()
+    args = parser.parse_args(argv)
+    try:
+        cont = Contractions(w2v_path=args.w2v_path, lang_code=args.lang, api_key=args.api_key, kv_path=args.kv_path,
+                            beam_width=args.beam_width, cache_size=args.cache_size, cache_path=args.cache_path,
+                            scorer=args.scorer, context_index=args.context_index)
+    except AttributeError as e:
+        # Such as an unknown scorer or a cache saved with other models
+        parser.error(str(e))
+
+    if args.input == '-':
+        infile = io.open(sys.stdin.fileno(), encoding='utf-8', closefd=False)
+    else:
+        infile = io.open(args.input, encoding='utf-8')
+    outfile = io.open(sys.stdout.fileno(), 'w', encoding='utf-8', closefd=False)
+    progress = _Progress(args.progress)
+    # JSON records waiting for their text to come back, bounded by how far the batches read ahead
+    records = deque()
+
+    def texts():
+        for line in infile:
+            line = line.rstrip("\r\n")
+            if args.jsonl:
+                if not line.strip():
+                    # Kept as a blank line of the output
+                    records.append(None)
+                    yield ""
+                    continue
+                record = json.loads(line)
+                records.append(record)
+                text = record[args.field]
+            else:
+                text = line
+            yield text
+
+    if args.mode == 'expand':
+        results = cont.expand_texts(texts(), precise=args.precise, window=args.window, batch_size=args.batch_size,
+                                    workers=args.workers, chunksize=args.chunksize)
+    else:
+        results = cont.contract_texts(texts())
+
+    try:
+        for text in results:
+            progress.update(text)
+            if args.jsonl:
+                record = records.popleft()
+                if record is None:
+                    text = ""
+                else:
+                    record[args.field] = text
+                    text = json.dumps(record, ensure_ascii=False)
+            outfile.write(text + "\n")
+    finally:
+        outfile.flush()
+        if args.input != '-':
+            infile.close()
+        cont.close()
+    if args.cache_path is not None and cont.score_cache is not None:
+        cont.save_cache()
+    if args.progress > 0:
+        progress.report()
+
+
+if __name__ == '__main__':
+    main()
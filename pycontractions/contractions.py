@@ -1,288 +1,790 @@
 from __future__ import unicode_literals
 
-import gensim.downloader as api
-from gensim.models import KeyedVectors
-from itertools import combinations_with_replacement, permutations
-import language_check
+import atexit
+import bisect
+from .cache import ScoreCache
+from collections import deque
+from .instrumentation import Instrumentation, null_timer
+from itertools import islice
 import os
 import re
+import shutil
+import sys
+import tempfile
+from timeit import default_timer
+import warnings
+
 
 # Lists derived from https://en.wikipedia.org/wiki/Wikipedia:List_of_English_contractions
-simple_contractions = {
-    re.compile(r"\bcan'?t\b", re.I | re.U): "cannot",
-    re.compile(r"\bcan'?t'?ve\b", re.I | re.U): "cannot have",
-    re.compile(r"\b'?cause\b", re.I | re.U): "because",
-    re.compile(r"\bcould'?ve\b", re.I | re.U): "could have",
-    re.compile(r"\bcouldn'?t\b", re.I | re.U): "could not",
-    re.compile(r"\bcouldn'?t'?ve\b", re.I | re.U): "could not have",
-    re.compile(r"\bdidn'?t\b", re.I | re.U): "did not",
-    re.compile(r"\bdoesn'?t\b", re.I | re.U): "does not",
-    re.compile(r"\bdon'?t\b", re.I | re.U): "do not",
-    re.compile(r"\bdoin'?\b", re.I | re.U): "doing",
-    re.compile(r"\bdunno\b", re.I | re.U): "do not know",
-    re.compile(r"\bgimme'?\b", re.I | re.U): "give me",
-    re.compile(r"\bgoin'?\b", re.I | re.U): "going",
-    re.compile(r"\bgonna'?\b", re.I | re.U): "going to",
-    re.compile(r"\bhadn'?t\b", re.I | re.U): "had not",
-    re.compile(r"\bhadn'?t'?ve\b", re.I | re.U): "had not have",
-    re.compile(r"\bhasn'?t\b", re.I | re.U): "has not",
-    re.compile(r"\bhaven'?t\b", re.I | re.U): "have not",
-    re.compile(r"\bhe'?d'?ve\b", re.I | re.U): "he would have",
-    re.compile(r"\bhow'?d\b", re.I | re.U): "how did",
-    re.compile(r"\bhow'?d'?y\b", re.I | re.U): "how do you",
-    re.compile(r"\bhow'?ll\b", re.I | re.U): "how will",
-    re.compile(r"\bI'?d'?ve\b", re.I | re.U): "I would have",
-    # May replace the abbreviation "im" as in Instant Messenger.
-    # If this abbreviation is in your data remove the "?"
-    re.compile(r"\bI'?m\b", re.I | re.U): "I am",
-    re.compile(r"\bI'?ve\b", re.I | re.U): "I have",
-    re.compile(r"\bisn'?t\b", re.I | re.U): "is not",
-    re.compile(r"\bit'?d'?ve\b", re.I | re.U): "it would have",
-    re.compile(r"\bkinda\b", re.I | re.U): "kind of",
-    re.compile(r"\blet'?s\b", re.I | re.U): "let us",
-    re.compile(r"\bma'?am\b", re.I | re.U): "madam",
-    re.compile(r"\bmayn'?t\b", re.I | re.U): "may not",
-    re.compile(r"\bmight'?ve\b", re.I | re.U): "might have",
-    re.compile(r"\bmightn'?t\b", re.I | re.U): "might not",
-    re.compile(r"\bmightn'?t'?ve\b", re.I | re.U): "might not have",
-    re.compile(r"\bmust'?ve\b", re.I | re.U): "must have",
-    re.compile(r"\bmustn'?t\b", re.I | re.U): "must not",
-    re.compile(r"\bmustn'?t'?ve\b", re.I | re.U): "must not have",
-    re.compile(r"\bnothin'?\b", re.I | re.U): "nothing",
-    re.compile(r"\bneedn'?t\b", re.I | re.U): "need not",
-    re.compile(r"\bneedn'?t'?ve\b", re.I | re.U): "need not have",
-    re.compile(r"\bo'?clock\b", re.I | re.U): "of the clock",
-    re.compile(r"\boughta\b", re.I | re.U): "ought to",
-    re.compile(r"\boughtn'?t\b", re.I | re.U): "ought not",
-    re.compile(r"\boughtn'?t'?ve\b", re.I | re.U): "ought not have",
-    re.compile(r"\bshan'?t\b", re.I | re.U): "shall not",
-    re.compile(r"\bsha'?n'?t\b", re.I | re.U): "shall not",
-    re.compile(r"\bshan'?t'?ve\b", re.I | re.U): "shall not have",
-    re.compile(r"\bshe'?d'?ve\b", re.I | re.U): "she would have",
-    re.compile(r"\bshould'?ve\b", re.I | re.U): "should have",
-    re.compile(r"\bshouldn'?t\b", re.I | re.U): "should not",
-    re.compile(r"\bshouldn'?t'?ve\b", re.I | re.U): "should not have",
-    re.compile(r"\bso'?ve\b", re.I | re.U): "so have",
-    re.compile(r"\bsomethin'?\b", re.I | re.U): "something",
-    re.compile(r"\bthat'?d'?ve\b", re.I | re.U): "that would have",
-    re.compile(r"\bthere'?d'?ve\b", re.I | re.U): "there would have",
-    re.compile(r"\bthey'?d'?ve\b", re.I | re.U): "they would have",
-    re.compile(r"\bthey'?re\b", re.I | re.U): "they are",
-    re.compile(r"\bthey'?ve\b", re.I | re.U): "they have",
-    re.compile(r"\b'?tis\b", re.I | re.U): "it is",
-    re.compile(r"\bto'?ve\b", re.I | re.U): "to have",
-    re.compile(r"\bu\b(?!\.)", re.I | re.U): "you",
-    re.compile(r"\bwasn'?t\b", re.I | re.U): "was not",
-    re.compile(r"\bwanna'?\b", re.I | re.U): "want to",
-    re.compile(r"\bwe'?d'?ve\b", re.I | re.U): "we would have",
-    re.compile(r"\bwe'll\b", re.I | re.U): "we will",
-    re.compile(r"\bwe'?ll'?ve\b", re.I | re.U): "we will have",
-    re.compile(r"\bwe're\b", re.I | re.U): "we are",
-    re.compile(r"\bwe'?ve\b", re.I | re.U): "we have",
-    re.compile(r"\bweren'?t\b", re.I | re.U): "were not",
-    re.compile(r"\bwhat'?re\b", re.I | re.U): "what are",
-    re.compile(r"\bwhat'?ve\b", re.I | re.U): "what have",
-    re.compile(r"\bwhen'?ve\b", re.I | re.U): "when have",
-    re.compile(r"\bwhere'?d\b", re.I | re.U): "where did",
-    re.compile(r"\bwhere'?ve\b", re.I | re.U): "where have",
-    re.compile(r"\bwho'?ve\b", re.I | re.U): "who have",
-    re.compile(r"\bwhy'?ve\b", re.I | re.U): "why have",
-    re.compile(r"\bwill'?ve\b", re.I | re.U): "will have",
-    re.compile(r"\bwon'?t\b", re.I | re.U): "will not",
-    re.compile(r"\bwon'?t'?ve\b", re.I | re.U): "will not have",
-    re.compile(r"\bwould'?ve\b", re.I | re.U): "would have",
-    re.compile(r"\bwouldn'?t\b", re.I | re.U): "would not",
-    re.compile(r"\bwouldn'?t'?ve\b", re.I | re.U): "would not have",
-    re.compile(r"\by'?all\b", re.I | re.U): "you all",
-    re.compile(r"\by'?all'?d\b", re.I | re.U): "you all would",
-    re.compile(r"\by'?all'?d'?ve\b", re.I | re.U): "you all would have",
-    re.compile(r"\by'?all'?re\b", re.I | re.U): "you all are",
-    re.compile(r"\by'?all'?ve\b", re.I | re.U): "you all have",
-    re.compile(r"\byou'?d'?ve\b", re.I | re.U): "you would have",
-    re.compile(r"\byou'?re\b", re.I | re.U): "you are",
-    re.compile(r"\byou'?ve\b", re.I | re.U): "you have"
-}
-
-contextual_contractions = {
-    re.compile(r"\bain'?t\b", re.I | re.U): ["am not", "are not", "is not", "has not", "have not"],
-    re.compile(r"\baren'?t\b", re.I | re.U): ["are not", "am not"],
-    re.compile(r"\bhe'?d\b", re.I | re.U): ["he had", "he would"],
-    re.compile(r"\bhe'll\b", re.I | re.U): ["he shall", "he will"],
-    re.compile(r"\bhe'?ll'?ve\b", re.I | re.U): ["he shall have", "he will have"],
-    re.compile(r"\bhe'?s\b", re.I | re.U): ["he has", "he is"],
-    re.compile(r"\bhow'?s\b", re.I | re.U): ["how has", "how is", "how does"],
-    # "id" is a common abbreviation for Identification.
-    # If this abbreviation does NOT appear in your data add the "?"
-    re.compile(r"\bI'd\b", re.I | re.U): ["I had", "I would"],
-    re.compile(r"\bI'll\b", re.I | re.U): ["I shall", "I will"],
-    re.compile(r"\bI'?ll'?ve\b", re.I | re.U): ["I shall have", "I will have"],
-    re.compile(r"\bit'?d\b", re.I | re.U): ["it had", "it would"],
-    re.compile(r"\bit'?ll\b", re.I | re.U): ["it shall", "it will"],
-    re.compile(r"\bit'?ll'?ve\b", re.I | re.U): ["it shall have", "it will have"],
-    # Possessive form does not have apostrophe
-    re.compile(r"\bit's\b", re.I | re.U): ["it has", "it is"],
-    re.compile(r"\bshe'?d\b", re.I | re.U): ["she had", "she would"],
-    re.compile(r"\bshe'll\b", re.I | re.U): ["she shall", "she will"],
-    re.compile(r"\bshe'?ll'?ve\b", re.I | re.U): ["she shall have", "she will have"],
-    re.compile(r"\bshe'?s\b", re.I | re.U): ["she has", "she is"],
-    # May replace the abbreviation "sos" as in Save Our Souls.
-    # If this abbreviation is in your data remove the "?"
-    re.compile(r"\bso'?s\b", re.I | re.U): ["so as", "so is"],
-    re.compile(r"\bthat'?d\b", re.I | re.U): ["that would", "that had"],
-    re.compile(r"\bthat'?s\b", re.I | re.U): ["that has", "that is"],
-    re.compile(r"\bthere'?d\b", re.I | re.U): ["there had", "there would"],
-    re.compile(r"\bthere'?s\b", re.I | re.U): ["there has", "there is"],
-    re.compile(r"\bthey'?d\b", re.I | re.U): ["they had", "they would"],
-    re.compile(r"\bthey'?ll\b", re.I | re.U): ["they shall", "they will"],
-    re.compile(r"\bthey'?ll'?ve\b", re.I | re.U): ["they shall have", "they will have"],
-    re.compile(r"\bwe'd\b", re.I | re.U): ["we had", "we would"],
-    re.compile(r"\bwhat'?ll\b", re.I | re.U): ["what shall", "what will"],
-    re.compile(r"\bwhat'?ll'?ve\b", re.I | re.U): ["what shall have", "what will have"],
-    re.compile(r"\bwhat'?s\b", re.I | re.U): ["what has", "what is"],
-    re.compile(r"\bwhen'?s\b", re.I | re.U): ["when has", "when is"],
-    re.compile(r"\bwhere'?s\b", re.I | re.U): ["where has", "where is"],
-    re.compile(r"\bwho'?ll\b", re.I | re.U): ["who shall", "who will"],
-    re.compile(r"\bwho'?ll'?ve\b", re.I | re.U): ["who shall have", "who will have"],
-    re.compile(r"\bwho'?s\b", re.I | re.U): ["who has", "who is"],
-    re.compile(r"\bwhy'?s\b", re.I | re.U): ["why has", "why is"],
-    re.compile(r"\byou'?d\b", re.I | re.U): ["you had", "you would"],
-    re.compile(r"\byou'?ll\b", re.I | re.U): ["you shall", "you will"],
-    re.compile(r"\byou'?ll'?ve\b", re.I | re.U): ["you shall have", "you will have"],
-}
-
-expansions = {
-    re.compile(r"\bare\s+not\b", re.I | re.U): "aren't",
-    re.compile(r"\bcannot\b", re.I | re.U): "can't",
-    re.compile(r"\bcould\s+have\b", re.I | re.U): "could've",
-    re.compile(r"\bcould\s+not\b", re.I | re.U): "couldn't",
-    re.compile(r"\bdid\s+not\b", re.I | re.U): "didn't",
-    re.compile(r"\bdoes\s+not\b", re.I | re.U): "doesn't",
-    re.compile(r"\bdo\s+not\b", re.I | re.U): "don't",
-    re.compile(r"\bgot\s+to\b", re.I | re.U): "gotta",
-    re.compile(r"\bhad\s+not\b", re.I | re.U): "hadn't",
-    re.compile(r"\bhas\s+not\b", re.I | re.U): "hasn't",
-    re.compile(r"\bhave\s+not\b", re.I | re.U): "haven't",
-    re.compile(r"\bhe\s+had\b", re.I | re.U): "he'd",
-    re.compile(r"\bhe\s+would\b", re.I | re.U): "he'd",
-    re.compile(r"\bhe\s+shall\b", re.I | re.U): "he'll",
-    re.compile(r"\bhe\s+will\b", re.I | re.U): "he'll",
-    re.compile(r"\bhe\s+has\b", re.I | re.U): "he's",
-    re.compile(r"\bhe\s+is\b", re.I | re.U): "he's",
-    re.compile(r"\bhow\s+did\b", re.I | re.U): "how'd",
-    re.compile(r"\bhow\s+would\b", re.I | re.U): "how'd",
-    re.compile(r"\bhow\s+will\b", re.I | re.U): "how'll",
-    re.compile(r"\bhow\s+has\b", re.I | re.U): "how's",
-    re.compile(r"\bhow\s+is\b", re.I | re.U): "how's",
-    re.compile(r"\bhow\s+does\b", re.I | re.U): "how's",
-    re.compile(r"\bI\s+had\b", re.I | re.U): "I'd",
-    re.compile(r"\bI\s+would\b", re.I | re.U): "I'd",
-    re.compile(r"\bI\s+shall\b", re.I | re.U): "I'll",
-    re.compile(r"\bI\s+will\b", re.I | re.U): "I'll",
-    re.compile(r"\bI\s+am\b", re.I | re.U): "I'm",
-    re.compile(r"\bI\s+have\b", re.I | re.U): "I've",
-    re.compile(r"\bis\s+not\b", re.I | re.U): "isn't",
-    re.compile(r"\bit\s+would\b", re.I | re.U): "it'd",
-    re.compile(r"\bit\s+shall\b", re.I | re.U): "it'll",
-    re.compile(r"\bit\s+will\b", re.I | re.U): "it'll",
-    re.compile(r"\bit\s+has\b", re.I | re.U): "it's",
-    re.compile(r"\bit\s+is\b", re.I | re.U): "it's",
-    re.compile(r"\bmay\s+have\b", re.I | re.U): "may've",
-    re.compile(r"\bmight\s+not\b", re.I | re.U): "mightn't",
-    re.compile(r"\bmight\s+have\b", re.I | re.U): "might've",
-    re.compile(r"\bmust\s+not\b", re.I | re.U): "mustn't",
-    re.compile(r"\bmust\s+have\b", re.I | re.U): "must've",
-    re.compile(r"\bneed\s+not\b", re.I | re.U): "needn't",
-    re.compile(r"\bof\s+the\s+clock\b", re.I | re.U): "o'clock",
-    re.compile(r"\bought\s+not\b", re.I | re.U): "oughtn't",
-    re.compile(r"\bshall\s+not\b", re.I | re.U): "shan't",
-    re.compile(r"\bshe\s+had\b", re.I | re.U): "she'd",
-    re.compile(r"\bshe\s+would\b", re.I | re.U): "she'd",
-    re.compile(r"\bshe\s+shall\b", re.I | re.U): "she'll",
-    re.compile(r"\bshe\s+will\b", re.I | re.U): "she'll",
-    re.compile(r"\bshe\s+has\b", re.I | re.U): "she's",
-    re.compile(r"\bshe\s+is\b", re.I | re.U): "she's",
-    re.compile(r"\bshould\s+have\b", re.I | re.U): "should've",
-    re.compile(r"\bshould\s+not\b", re.I | re.U): "shouldn't",
-    re.compile(r"\bsomebody\s+has\b", re.I | re.U): "somebody's",
-    re.compile(r"\bsomebody\s+is\b", re.I | re.U): "somebody's",
-    re.compile(r"\bsomeone\s+has\b", re.I | re.U): "someone's",
-    re.compile(r"\bsomeone\s+is\b", re.I | re.U): "someone's",
-    re.compile(r"\bsomething\s+has\b", re.I | re.U): "something's",
-    re.compile(r"\bsomething\s+is\b", re.I | re.U): "something's",
-    re.compile(r"\bthat\s+shall\b", re.I | re.U): "that'll",
-    re.compile(r"\bthat\s+will\b", re.I | re.U): "that'll",
-    re.compile(r"\bthat\s+are\b", re.I | re.U): "that're",
-    re.compile(r"\bthat\s+has\b", re.I | re.U): "that's",
-    re.compile(r"\bthat\s+is\b", re.I | re.U): "that's",
-    re.compile(r"\bthat\s+would\b", re.I | re.U): "that'd",
-    re.compile(r"\bthat\s+had\b", re.I | re.U): "that'd",
-    re.compile(r"\bthere\s+had\b", re.I | re.U): "there'd",
-    re.compile(r"\bthere\s+would\b", re.I | re.U): "there'd",
-    re.compile(r"\bthere\s+are\b", re.I | re.U): "there're",
-    re.compile(r"\bthere\s+has\b", re.I | re.U): "there's",
-    re.compile(r"\bthere\s+is\b", re.I | re.U): "there's",
-    re.compile(r"\bthese\s+are\b", re.I | re.U): "these're",
-    re.compile(r"\bthey\s+had\b", re.I | re.U): "they'd",
-    re.compile(r"\bthey\s+would\b", re.I | re.U): "they'd",
-    re.compile(r"\bthey\s+shall\b", re.I | re.U): "they'll",
-    re.compile(r"\bthey\s+will\b", re.I | re.U): "they'll",
-    re.compile(r"\bthey\s+are\b", re.I | re.U): "they're",
-    re.compile(r"\bthey\s+have\b", re.I | re.U): "they've",
-    re.compile(r"\bthis\s+has\b", re.I | re.U): "this's",
-    re.compile(r"\bthis\s+is\b", re.I | re.U): "this's",
-    re.compile(r"\bthose\s+are\b", re.I | re.U): "those're",
-    re.compile(r"\bwas\s+not\b", re.I | re.U): "wasn't",
-    re.compile(r"\bwe\s+had\b", re.I | re.U): "we'd",
-    re.compile(r"\bwe\s+would\b", re.I | re.U): "we'd",
-    re.compile(r"\bwe\s+would\s+have\b", re.I | re.U): "we'd've",
-    re.compile(r"\bwe\s+will\b", re.I | re.U): "we'll",
-    re.compile(r"\bwe\s+are\b", re.I | re.U): "we're",
-    re.compile(r"\bwe\s+have\b", re.I | re.U): "we've",
-    re.compile(r"\bwere\s+not\b", re.I | re.U): "weren't",
-    re.compile(r"\bwhat\s+did\b", re.I | re.U): "what'd",
-    re.compile(r"\bwhat\s+shall\b", re.I | re.U): "what'll",
-    re.compile(r"\bwhat\s+will\b", re.I | re.U): "what'll",
-    re.compile(r"\bwhat\s+are\b", re.I | re.U): "what're",
-    re.compile(r"\bwhat\s+has\b", re.I | re.U): "what's",
-    re.compile(r"\bwhat\s+is\b", re.I | re.U): "what's",
-    re.compile(r"\bwhat\s+does\b", re.I | re.U): "what's",
-    re.compile(r"\bwhat\s+have\b", re.I | re.U): "what've",
-    re.compile(r"\bwhen\s+has\b", re.I | re.U): "when's",
-    re.compile(r"\bwhen\s+is\b", re.I | re.U): "when's",
-    re.compile(r"\bwhere\s+did\b", re.I | re.U): "where'd",
-    re.compile(r"\bwhere\s+are\b", re.I | re.U): "where're",
-    re.compile(r"\bwhere\s+has\b", re.I | re.U): "where's",
-    re.compile(r"\bwhere\s+is\b", re.I | re.U): "where's",
-    re.compile(r"\bwhere\s+does\b", re.I | re.U): "where's",
-    re.compile(r"\bwhere\s+have\b", re.I | re.U): "where've",
-    re.compile(r"\bwhich\s+has\b", re.I | re.U): "which's",
-    re.compile(r"\bwhich\s+is\b", re.I | re.U): "which's",
-    re.compile(r"\bwho\s+would\b", re.I | re.U): "who'd",
-    re.compile(r"\bwho\s+had\b", re.I | re.U): "who'd",
-    re.compile(r"\bwho\s+did\b", re.I | re.U): "who'd",
-    re.compile(r"\bwho\s+would\s+have\b", re.I | re.U): "who'd've",
-    re.compile(r"\bwho\s+shall\b", re.I | re.U): "who'll",
-    re.compile(r"\bwho\s+will\b", re.I | re.U): "who'll",
-    re.compile(r"\bwho\s+are\b", re.I | re.U): "who're",
-    re.compile(r"\bwho\s+has\b", re.I | re.U): "who's",
-    re.compile(r"\bwho\s+is\b", re.I | re.U): "who's",
-    re.compile(r"\bwho\s+does\b", re.I | re.U): "who's",
-    re.compile(r"\bwho\s+have\b", re.I | re.U): "who've",
-    re.compile(r"\bwhy\s+did\b", re.I | re.U): "why'd",
-    re.compile(r"\bwhy\s+are\b", re.I | re.U): "why're",
-    re.compile(r"\bwhy\s+has\b", re.I | re.U): "why's",
-    re.compile(r"\bwhy\s+is\b", re.I | re.U): "why's",
-    re.compile(r"\bwhy\s+does\b", re.I | re.U): "why's",
-    re.compile(r"\bwill\s+not\b", re.I | re.U): "won't",
-    re.compile(r"\bwould\s+have\b", re.I | re.U): "would've",
-    re.compile(r"\bwould\s+not\b", re.I | re.U): "wouldn't",
-    re.compile(r"\byou\s+had\b", re.I | re.U): "you'd",
-    re.compile(r"\byou\s+would\b", re.I | re.U): "you'd",
-    re.compile(r"\byou\s+shall\b", re.I | re.U): "you'll",
-    re.compile(r"\byou\s+will\b", re.I | re.U): "you'll",
-    re.compile(r"\byou\s+are\b", re.I | re.U): "you're",
-    re.compile(r"\byou\s+have\b", re.I | re.U): "you've",
-}
+def _simple_contractions():
+    """Return the contractions with a single expansion, compiled."""
+    return {
+        re.compile(r"\bcan'?t\b", re.I | re.U): "cannot",
+        re.compile(r"\bcan'?t'?ve\b", re.I | re.U): "cannot have",
+        re.compile(r"\b'?cause\b", re.I | re.U): "because",
+        re.compile(r"\bcould'?ve\b", re.I | re.U): "could have",
+        re.compile(r"\bcouldn'?t\b", re.I | re.U): "could not",
+        re.compile(r"\bcouldn'?t'?ve\b", re.I | re.U): "could not have",
+        re.compile(r"\bdidn'?t\b", re.I | re.U): "did not",
+        re.compile(r"\bdoesn'?t\b", re.I | re.U): "does not",
+        re.compile(r"\bdon'?t\b", re.I | re.U): "do not",
+        re.compile(r"\bdoin'?\b", re.I | re.U): "doing",
+        re.compile(r"\bdunno\b", re.I | re.U): "do not know",
+        re.compile(r"\bgimme'?\b", re.I | re.U): "give me",
+        re.compile(r"\bgoin'?\b", re.I | re.U): "going",
+        re.compile(r"\bgonna'?\b", re.I | re.U): "going to",
+        re.compile(r"\bhadn'?t\b", re.I | re.U): "had not",
+        re.compile(r"\bhadn'?t'?ve\b", re.I | re.U): "had not have",
+        re.compile(r"\bhasn'?t\b", re.I | re.U): "has not",
+        re.compile(r"\bhaven'?t\b", re.I | re.U): "have not",
+        re.compile(r"\bhe'?d'?ve\b", re.I | re.U): "he would have",
+        re.compile(r"\bhow'?d\b", re.I | re.U): "how did",
+        re.compile(r"\bhow'?d'?y\b", re.I | re.U): "how do you",
+        re.compile(r"\bhow'?ll\b", re.I | re.U): "how will",
+        re.compile(r"\bI'?d'?ve\b", re.I | re.U): "I would have",
+        # May replace the abbreviation "im" as in Instant Messenger.
+        # If this abbreviation is in your data remove the "?"
+        re.compile(r"\bI'?m\b", re.I | re.U): "I am",
+        re.compile(r"\bI'?ve\b", re.I | re.U): "I have",
+        re.compile(r"\bisn'?t\b", re.I | re.U): "is not",
+        re.compile(r"\bit'?d'?ve\b", re.I | re.U): "it would have",
+        re.compile(r"\bkinda\b", re.I | re.U): "kind of",
+        re.compile(r"\blet'?s\b", re.I | re.U): "let us",
+        re.compile(r"\bma'?am\b", re.I | re.U): "madam",
+        re.compile(r"\bmayn'?t\b", re.I | re.U): "may not",
+        re.compile(r"\bmight'?ve\b", re.I | re.U): "might have",
+        re.compile(r"\bmightn'?t\b", re.I | re.U): "might not",
+        re.compile(r"\bmightn'?t'?ve\b", re.I | re.U): "might not have",
+        re.compile(r"\bmust'?ve\b", re.I | re.U): "must have",
+        re.compile(r"\bmustn'?t\b", re.I | re.U): "must not",
+        re.compile(r"\bmustn'?t'?ve\b", re.I | re.U): "must not have",
+        re.compile(r"\bnothin'?\b", re.I | re.U): "nothing",
+        re.compile(r"\bneedn'?t\b", re.I | re.U): "need not",
+        re.compile(r"\bneedn'?t'?ve\b", re.I | re.U): "need not have",
+        re.compile(r"\bo'?clock\b", re.I | re.U): "of the clock",
+        re.compile(r"\boughta\b", re.I | re.U): "ought to",
+        re.compile(r"\boughtn'?t\b", re.I | re.U): "ought not",
+        re.compile(r"\boughtn'?t'?ve\b", re.I | re.U): "ought not have",
+        re.compile(r"\bshan'?t\b", re.I | re.U): "shall not",
+        re.compile(r"\bsha'?n'?t\b", re.I | re.U): "shall not",
+        re.compile(r"\bshan'?t'?ve\b", re.I | re.U): "shall not have",
+        re.compile(r"\bshe'?d'?ve\b", re.I | re.U): "she would have",
+        re.compile(r"\bshould'?ve\b", re.I | re.U): "should have",
+        re.compile(r"\bshouldn'?t\b", re.I | re.U): "should not",
+        re.compile(r"\bshouldn'?t'?ve\b", re.I | re.U): "should not have",
+        re.compile(r"\bso'?ve\b", re.I | re.U): "so have",
+        re.compile(r"\bsomethin'?\b", re.I | re.U): "something",
+        re.compile(r"\bthat'?d'?ve\b", re.I | re.U): "that would have",
+        re.compile(r"\bthere'?d'?ve\b", re.I | re.U): "there would have",
+        re.compile(r"\bthey'?d'?ve\b", re.I | re.U): "they would have",
+        re.compile(r"\bthey'?re\b", re.I | re.U): "they are",
+        re.compile(r"\bthey'?ve\b", re.I | re.U): "they have",
+        re.compile(r"\b'?tis\b", re.I | re.U): "it is",
+        re.compile(r"\bto'?ve\b", re.I | re.U): "to have",
+        re.compile(r"\bu\b(?!\.)", re.I | re.U): "you",
+        re.compile(r"\bwasn'?t\b", re.I | re.U): "was not",
+        re.compile(r"\bwanna'?\b", re.I | re.U): "want to",
+        re.compile(r"\bwe'?d'?ve\b", re.I | re.U): "we would have",
+        re.compile(r"\bwe'll\b", re.I | re.U): "we will",
+        re.compile(r"\bwe'?ll'?ve\b", re.I | re.U): "we will have",
+        re.compile(r"\bwe're\b", re.I | re.U): "we are",
+        re.compile(r"\bwe'?ve\b", re.I | re.U): "we have",
+        re.compile(r"\bweren'?t\b", re.I | re.U): "were not",
+        re.compile(r"\bwhat'?re\b", re.I | re.U): "what are",
+        re.compile(r"\bwhat'?ve\b", re.I | re.U): "what have",
+        re.compile(r"\bwhen'?ve\b", re.I | re.U): "when have",
+        re.compile(r"\bwhere'?d\b", re.I | re.U): "where did",
+        re.compile(r"\bwhere'?ve\b", re.I | re.U): "where have",
+        re.compile(r"\bwho'?ve\b", re.I | re.U): "who have",
+        re.compile(r"\bwhy'?ve\b", re.I | re.U): "why have",
+        re.compile(r"\bwill'?ve\b", re.I | re.U): "will have",
+        re.compile(r"\bwon'?t\b", re.I | re.U): "will not",
+        re.compile(r"\bwon'?t'?ve\b", re.I | re.U): "will not have",
+        re.compile(r"\bwould'?ve\b", re.I | re.U): "would have",
+        re.compile(r"\bwouldn'?t\b", re.I | re.U): "would not",
+        re.compile(r"\bwouldn'?t'?ve\b", re.I | re.U): "would not have",
+        re.compile(r"\by'?all\b", re.I | re.U): "you all",
+        re.compile(r"\by'?all'?d\b", re.I | re.U): "you all would",
+        re.compile(r"\by'?all'?d'?ve\b", re.I | re.U): "you all would have",
+        re.compile(r"\by'?all'?re\b", re.I | re.U): "you all are",
+        re.compile(r"\by'?all'?ve\b", re.I | re.U): "you all have",
+        re.compile(r"\byou'?d'?ve\b", re.I | re.U): "you would have",
+        re.compile(r"\byou'?re\b", re.I | re.U): "you are",
+        re.compile(r"\byou'?ve\b", re.I | re.U): "you have"
+    }
+
+
+def _contextual_contractions():
+    """Return the contractions whose expansion depends on the context, compiled."""
+    return {
+        re.compile(r"\bain'?t\b", re.I | re.U): ["am not", "are not", "is not", "has not", "have not"],
+        re.compile(r"\baren'?t\b", re.I | re.U): ["are not", "am not"],
+        re.compile(r"\bhe'?d\b", re.I | re.U): ["he had", "he would"],
+        re.compile(r"\bhe'll\b", re.I | re.U): ["he shall", "he will"],
+        re.compile(r"\bhe'?ll'?ve\b", re.I | re.U): ["he shall have", "he will have"],
+        re.compile(r"\bhe'?s\b", re.I | re.U): ["he has", "he is"],
+        re.compile(r"\bhow'?s\b", re.I | re.U): ["how has", "how is", "how does"],
+        # "id" is a common abbreviation for Identification.
+        # If this abbreviation does NOT appear in your data add the "?"
+        re.compile(r"\bI'd\b", re.I | re.U): ["I had", "I would"],
+        re.compile(r"\bI'll\b", re.I | re.U): ["I shall", "I will"],
+        re.compile(r"\bI'?ll'?ve\b", re.I | re.U): ["I shall have", "I will have"],
+        re.compile(r"\bit'?d\b", re.I | re.U): ["it had", "it would"],
+        re.compile(r"\bit'?ll\b", re.I | re.U): ["it shall", "it will"],
+        re.compile(r"\bit'?ll'?ve\b", re.I | re.U): ["it shall have", "it will have"],
+        # Possessive form does not have apostrophe
+        re.compile(r"\bit's\b", re.I | re.U): ["it has", "it is"],
+        re.compile(r"\bshe'?d\b", re.I | re.U): ["she had", "she would"],
+        re.compile(r"\bshe'll\b", re.I | re.U): ["she shall", "she will"],
+        re.compile(r"\bshe'?ll'?ve\b", re.I | re.U): ["she shall have", "she will have"],
+        re.compile(r"\bshe'?s\b", re.I | re.U): ["she has", "she is"],
+        # May replace the abbreviation "sos" as in Save Our Souls.
+        # If this abbreviation is in your data remove the "?"
+        re.compile(r"\bso'?s\b", re.I | re.U): ["so as", "so is"],
+        re.compile(r"\bthat'?d\b", re.I | re.U): ["that would", "that had"],
+        re.compile(r"\bthat'?s\b", re.I | re.U): ["that has", "that is"],
+        re.compile(r"\bthere'?d\b", re.I | re.U): ["there had", "there would"],
+        re.compile(r"\bthere'?s\b", re.I | re.U): ["there has", "there is"],
+        re.compile(r"\bthey'?d\b", re.I | re.U): ["they had", "they would"],
+        re.compile(r"\bthey'?ll\b", re.I | re.U): ["they shall", "they will"],
+        re.compile(r"\bthey'?ll'?ve\b", re.I | re.U): ["they shall have", "they will have"],
+        re.compile(r"\bwe'd\b", re.I | re.U): ["we had", "we would"],
+        re.compile(r"\bwhat'?ll\b", re.I | re.U): ["what shall", "what will"],
+        re.compile(r"\bwhat'?ll'?ve\b", re.I | re.U): ["what shall have", "what will have"],
+        re.compile(r"\bwhat'?s\b", re.I | re.U): ["what has", "what is"],
+        re.compile(r"\bwhen'?s\b", re.I | re.U): ["when has", "when is"],
+        re.compile(r"\bwhere'?s\b", re.I | re.U): ["where has", "where is"],
+        re.compile(r"\bwho'?ll\b", re.I | re.U): ["who shall", "who will"],
+        re.compile(r"\bwho'?ll'?ve\b", re.I | re.U): ["who shall have", "who will have"],
+        re.compile(r"\bwho'?s\b", re.I | re.U): ["who has", "who is"],
+        re.compile(r"\bwhy'?s\b", re.I | re.U): ["why has", "why is"],
+        re.compile(r"\byou'?d\b", re.I | re.U): ["you had", "you would"],
+        re.compile(r"\byou'?ll\b", re.I | re.U): ["you shall", "you will"],
+        re.compile(r"\byou'?ll'?ve\b", re.I | re.U): ["you shall have", "you will have"],
+    }
+
+
+def _expansions():
+    """Return the expansions that are contracted, compiled."""
+    return {
+        re.compile(r"\bare\s+not\b", re.I | re.U): "aren't",
+        re.compile(r"\bcannot\b", re.I | re.U): "can't",
+        re.compile(r"\bcould\s+have\b", re.I | re.U): "could've",
+        re.compile(r"\bcould\s+not\b", re.I | re.U): "couldn't",
+        re.compile(r"\bdid\s+not\b", re.I | re.U): "didn't",
+        re.compile(r"\bdoes\s+not\b", re.I | re.U): "doesn't",
+        re.compile(r"\bdo\s+not\b", re.I | re.U): "don't",
+        re.compile(r"\bgot\s+to\b", re.I | re.U): "gotta",
+        re.compile(r"\bhad\s+not\b", re.I | re.U): "hadn't",
+        re.compile(r"\bhas\s+not\b", re.I | re.U): "hasn't",
+        re.compile(r"\bhave\s+not\b", re.I | re.U): "haven't",
+        re.compile(r"\bhe\s+had\b", re.I | re.U): "he'd",
+        re.compile(r"\bhe\s+would\b", re.I | re.U): "he'd",
+        re.compile(r"\bhe\s+shall\b", re.I | re.U): "he'll",
+        re.compile(r"\bhe\s+will\b", re.I | re.U): "he'll",
+        re.compile(r"\bhe\s+has\b", re.I | re.U): "he's",
+        re.compile(r"\bhe\s+is\b", re.I | re.U): "he's",
+        re.compile(r"\bhow\s+did\b", re.I | re.U): "how'd",
+        re.compile(r"\bhow\s+would\b", re.I | re.U): "how'd",
+        re.compile(r"\bhow\s+will\b", re.I | re.U): "how'll",
+        re.compile(r"\bhow\s+has\b", re.I | re.U): "how's",
+        re.compile(r"\bhow\s+is\b", re.I | re.U): "how's",
+        re.compile(r"\bhow\s+does\b", re.I | re.U): "how's",
+        re.compile(r"\bI\s+had\b", re.I | re.U): "I'd",
+        re.compile(r"\bI\s+would\b", re.I | re.U): "I'd",
+        re.compile(r"\bI\s+shall\b", re.I | re.U): "I'll",
+        re.compile(r"\bI\s+will\b", re.I | re.U): "I'll",
+        re.compile(r"\bI\s+am\b", re.I | re.U): "I'm",
+        re.compile(r"\bI\s+have\b", re.I | re.U): "I've",
+        re.compile(r"\bis\s+not\b", re.I | re.U): "isn't",
+        re.compile(r"\bit\s+would\b", re.I | re.U): "it'd",
+        re.compile(r"\bit\s+shall\b", re.I | re.U): "it'll",
+        re.compile(r"\bit\s+will\b", re.I | re.U): "it'll",
+        re.compile(r"\bit\s+has\b", re.I | re.U): "it's",
+        re.compile(r"\bit\s+is\b", re.I | re.U): "it's",
+        re.compile(r"\bmay\s+have\b", re.I | re.U): "may've",
+        re.compile(r"\bmight\s+not\b", re.I | re.U): "mightn't",
+        re.compile(r"\bmight\s+have\b", re.I | re.U): "might've",
+        re.compile(r"\bmust\s+not\b", re.I | re.U): "mustn't",
+        re.compile(r"\bmust\s+have\b", re.I | re.U): "must've",
+        re.compile(r"\bneed\s+not\b", re.I | re.U): "needn't",
+        re.compile(r"\bof\s+the\s+clock\b", re.I | re.U): "o'clock",
+        re.compile(r"\bought\s+not\b", re.I | re.U): "oughtn't",
+        re.compile(r"\bshall\s+not\b", re.I | re.U): "shan't",
+        re.compile(r"\bshe\s+had\b", re.I | re.U): "she'd",
+        re.compile(r"\bshe\s+would\b", re.I | re.U): "she'd",
+        re.compile(r"\bshe\s+shall\b", re.I | re.U): "she'll",
+        re.compile(r"\bshe\s+will\b", re.I | re.U): "she'll",
+        re.compile(r"\bshe\s+has\b", re.I | re.U): "she's",
+        re.compile(r"\bshe\s+is\b", re.I | re.U): "she's",
+        re.compile(r"\bshould\s+have\b", re.I | re.U): "should've",
+        re.compile(r"\bshould\s+not\b", re.I | re.U): "shouldn't",
+        re.compile(r"\bsomebody\s+has\b", re.I | re.U): "somebody's",
+        re.compile(r"\bsomebody\s+is\b", re.I | re.U): "somebody's",
+        re.compile(r"\bsomeone\s+has\b", re.I | re.U): "someone's",
+        re.compile(r"\bsomeone\s+is\b", re.I | re.U): "someone's",
+        re.compile(r"\bsomething\s+has\b", re.I | re.U): "something's",
+        re.compile(r"\bsomething\s+is\b", re.I | re.U): "something's",
+        re.compile(r"\bthat\s+shall\b", re.I | re.U): "that'll",
+        re.compile(r"\bthat\s+will\b", re.I | re.U): "that'll",
+        re.compile(r"\bthat\s+are\b", re.I | re.U): "that're",
+        re.compile(r"\bthat\s+has\b", re.I | re.U): "that's",
+        re.compile(r"\bthat\s+is\b", re.I | re.U): "that's",
+        re.compile(r"\bthat\s+would\b", re.I | re.U): "that'd",
+        re.compile(r"\bthat\s+had\b", re.I | re.U): "that'd",
+        re.compile(r"\bthere\s+had\b", re.I | re.U): "there'd",
+        re.compile(r"\bthere\s+would\b", re.I | re.U): "there'd",
+        re.compile(r"\bthere\s+are\b", re.I | re.U): "there're",
+        re.compile(r"\bthere\s+has\b", re.I | re.U): "there's",
+        re.compile(r"\bthere\s+is\b", re.I | re.U): "there's",
+        re.compile(r"\bthese\s+are\b", re.I | re.U): "these're",
+        re.compile(r"\bthey\s+had\b", re.I | re.U): "they'd",
+        re.compile(r"\bthey\s+would\b", re.I | re.U): "they'd",
+        re.compile(r"\bthey\s+shall\b", re.I | re.U): "they'll",
+        re.compile(r"\bthey\s+will\b", re.I | re.U): "they'll",
+        re.compile(r"\bthey\s+are\b", re.I | re.U): "they're",
+        re.compile(r"\bthey\s+have\b", re.I | re.U): "they've",
+        re.compile(r"\bthis\s+has\b", re.I | re.U): "this's",
+        re.compile(r"\bthis\s+is\b", re.I | re.U): "this's",
+        re.compile(r"\bthose\s+are\b", re.I | re.U): "those're",
+        re.compile(r"\bwas\s+not\b", re.I | re.U): "wasn't",
+        re.compile(r"\bwe\s+had\b", re.I | re.U): "we'd",
+        re.compile(r"\bwe\s+would\b", re.I | re.U): "we'd",
+        re.compile(r"\bwe\s+would\s+have\b", re.I | re.U): "we'd've",
+        re.compile(r"\bwe\s+will\b", re.I | re.U): "we'll",
+        re.compile(r"\bwe\s+are\b", re.I | re.U): "we're",
+        re.compile(r"\bwe\s+have\b", re.I | re.U): "we've",
+        re.compile(r"\bwere\s+not\b", re.I | re.U): "weren't",
+        re.compile(r"\bwhat\s+did\b", re.I | re.U): "what'd",
+        re.compile(r"\bwhat\s+shall\b", re.I | re.U): "what'll",
+        re.compile(r"\bwhat\s+will\b", re.I | re.U): "what'll",
+        re.compile(r"\bwhat\s+are\b", re.I | re.U): "what're",
+        re.compile(r"\bwhat\s+has\b", re.I | re.U): "what's",
+        re.compile(r"\bwhat\s+is\b", re.I | re.U): "what's",
+        re.compile(r"\bwhat\s+does\b", re.I | re.U): "what's",
+        re.compile(r"\bwhat\s+have\b", re.I | re.U): "what've",
+        re.compile(r"\bwhen\s+has\b", re.I | re.U): "when's",
+        re.compile(r"\bwhen\s+is\b", re.I | re.U): "when's",
+        re.compile(r"\bwhere\s+did\b", re.I | re.U): "where'd",
+        re.compile(r"\bwhere\s+are\b", re.I | re.U): "where're",
+        re.compile(r"\bwhere\s+has\b", re.I | re.U): "where's",
+        re.compile(r"\bwhere\s+is\b", re.I | re.U): "where's",
+        re.compile(r"\bwhere\s+does\b", re.I | re.U): "where's",
+        re.compile(r"\bwhere\s+have\b", re.I | re.U): "where've",
+        re.compile(r"\bwhich\s+has\b", re.I | re.U): "which's",
+        re.compile(r"\bwhich\s+is\b", re.I | re.U): "which's",
+        re.compile(r"\bwho\s+would\b", re.I | re.U): "who'd",
+        re.compile(r"\bwho\s+had\b", re.I | re.U): "who'd",
+        re.compile(r"\bwho\s+did\b", re.I | re.U): "who'd",
+        re.compile(r"\bwho\s+would\s+have\b", re.I | re.U): "who'd've",
+        re.compile(r"\bwho\s+shall\b", re.I | re.U): "who'll",
+        re.compile(r"\bwho\s+will\b", re.I | re.U): "who'll",
+        re.compile(r"\bwho\s+are\b", re.I | re.U): "who're",
+        re.compile(r"\bwho\s+has\b", re.I | re.U): "who's",
+        re.compile(r"\bwho\s+is\b", re.I | re.U): "who's",
+        re.compile(r"\bwho\s+does\b", re.I | re.U): "who's",
+        re.compile(r"\bwho\s+have\b", re.I | re.U): "who've",
+        re.compile(r"\bwhy\s+did\b", re.I | re.U): "why'd",
+        re.compile(r"\bwhy\s+are\b", re.I | re.U): "why're",
+        re.compile(r"\bwhy\s+has\b", re.I | re.U): "why's",
+        re.compile(r"\bwhy\s+is\b", re.I | re.U): "why's",
+        re.compile(r"\bwhy\s+does\b", re.I | re.U): "why's",
+        re.compile(r"\bwill\s+not\b", re.I | re.U): "won't",
+        re.compile(r"\bwould\s+have\b", re.I | re.U): "would've",
+        re.compile(r"\bwould\s+not\b", re.I | re.U): "wouldn't",
+        re.compile(r"\byou\s+had\b", re.I | re.U): "you'd",
+        re.compile(r"\byou\s+would\b", re.I | re.U): "you'd",
+        re.compile(r"\byou\s+shall\b", re.I | re.U): "you'll",
+        re.compile(r"\byou\s+will\b", re.I | re.U): "you'll",
+        re.compile(r"\byou\s+are\b", re.I | re.U): "you're",
+        re.compile(r"\byou\s+have\b", re.I | re.U): "you've",
+    }
+
+
+def _compile_matcher(patterns):
+    """Combine an ordered list of patterns into one alternation that is scanned in a single pass.
+
+    Each alternative sits inside a lookahead so a scan reports a candidate at every position,
+    even where candidates overlap.  Alternatives are bucketed by their leading letter so only a
+    handful are tried at each word.  Returns the compiled matcher, a mapping from the group
+    number of each alternative to the index of its pattern, the patterns and the largest number
+    of whitespace separated words a pattern matches.
+    """
+    sources = [pattern.pattern for pattern in patterns]
+    words = 1 + max(source.count(r"\s") for source in sources)
+    # Factor out the leading word boundary so only word starts try the alternatives
+    prefix = ""
+    if all(source.startswith(r"\b") for source in sources):
+        prefix = r"\b"
+        sources = [source[2:] for source in sources]
+    buckets = {}
+    groups = {}
+    group = 1
+    for index, (pattern, source) in enumerate(zip(patterns, sources)):
+        lead = source[:1].lower()
+        if lead.isalpha() and source[1:2] not in ("?", "*", "+", "{"):
+            source = source[1:]
+        else:
+            lead = ""
+        buckets.setdefault(lead, []).append((index, source))
+    branches = []
+    for lead, alternatives in sorted(buckets.items(), key=lambda item: item[1][0][0]):
+        for index, source in alternatives:
+            groups[group] = index
+            group += patterns[index].groups + 1
+        branches.append("{}(?:{})".format(lead, "|".join("({})".format(source) for _, source in alternatives)))
+    matcher = re.compile(r"(?={}(?:{}))".format(prefix, "|".join(branches)), re.I | re.U)
+    return matcher, groups, patterns, words
+
+
+def _candidates(matcher, text, pos=0, endpos=None):
+    """Yield the (pattern index, start, end) candidates of a combined matcher in text[pos:endpos] by start."""
+    matcher, groups = matcher[:2]
+    for match in matcher.finditer(text, pos, len(text) if endpos is None else endpos):
+        yield groups[match.lastindex], match.start(), match.end(match.lastindex)
+
+
+def _find_matches(matcher, text):
+    """Return the non-overlapping (start, end, pattern index) matches of a combined matcher sorted by start.
+
+    Where candidates overlap, the pattern earliest in its table wins, which is the same outcome as
+    applying the patterns one after another in table order.
+    """
+    candidates = []
+    overlapping = False
+    last_end = 0
+    for index, start, end in _candidates(matcher, text):
+        overlapping = overlapping or start < last_end
+        last_end = max(last_end, end)
+        candidates.append((index, start, end))
+    if not overlapping:
+        return [(start, end, index) for index, start, end in candidates]
+
+    starts, ends, matches = [], [], []
+    for index, start, end in sorted(candidates):
+        i = bisect.bisect_left(starts, start)
+        if (i > 0 and ends[i - 1] > start) or (i < len(starts) and starts[i] < end):
+            continue
+        starts.insert(i, start)
+        ends.insert(i, end)
+        matches.insert(i, (start, end, index))
+    return matches
+
+
+def _rewrite(matcher, replacements, text):
+    """Return the sorted (start, end, replacement, pattern index) rewrites of text by a combined matcher.
+
+    Patterns with an index of len(replacements) or more keep the text they match.  When patterns
+    are applied one after another in table order a pattern also matches text produced by an
+    earlier one, as in "we'll've" to "we will've" to "we will have", so after the single pass the
+    text around each new replacement is scanned again, taking the matches of the earliest pattern
+    that overlap only replacements of earlier patterns, until nothing changes.
+    """
+    rewrites = [(start, end, replacements[index] if index < len(replacements) else text[start:end], index)
+                for start, end, index in _find_matches(matcher, text)]
+    fresh = [n for n, rewrite in enumerate(rewrites) if rewrite[3] < len(replacements)]
+    patterns, words = matcher[2:]
+    while fresh:
+        # A replacement can also remove the word boundary of a later match next to it, as in
+        # "goin'hadn't", which then keeps its original text, marked by a replacement of None
+        dropped = set()
+        for n in fresh:
+            start, end, rep, index = rewrites[n]
+            for m in (n - 1, n + 1):
+                if rep is None or m < 0 or m >= len(rewrites) or rewrites[m][3] <= index or rewrites[m][2] is None:
+                    continue
+                other_start, other_end, _, other = rewrites[m]
+                if m < n and other_end == start:
+                    context = text[max(other_start - 1, 0):other_start]
+                    local = context + text[other_start:other_end] + rep[:1]
+                elif m > n and other_start == end:
+                    context = rep[-1:]
+                    local = context + text[other_start:other_end + 1]
+                else:
+                    continue
+                match = patterns[other].match(local, len(context))
+                if match is None or match.end() != len(context) + other_end - other_start:
+                    dropped.add(m)
+        for m in dropped:
+            rewrites[m] = rewrites[m][:2] + (None, rewrites[m][3])
+        fresh = sorted(dropped.union(fresh))
+
+        # Offsets of each rewrite within the rewritten text
+        pieces = []
+        starts = []
+        ends = []
+        last = 0
+        pos = 0
+        for start, end, rep, _ in rewrites:
+            rep = text[start:end] if rep is None else rep
+            pieces.append(text[last:start])
+            pieces.append(rep)
+            pos += start - last
+            starts.append(pos)
+            pos += len(rep)
+            ends.append(pos)
+            last = end
+        pieces.append(text[last:])
+        rewritten = "".join(pieces)
+
+        # A new match overlaps a replacement, so it lies within the words of patterns around its tokens
+        bounds = []
+        for n in fresh:
+            lo, hi = _enclosing_token(rewritten, starts[n], ends[n])
+            lo, hi = _token_bounds(rewritten, lo, hi, words - 1)
+            if bounds and lo <= bounds[-1][1]:
+                bounds[-1] = (bounds[-1][0], max(hi, bounds[-1][1]))
+            else:
+                bounds.append((lo, hi))
+        chained = []
+        for lo, hi in bounds:
+            for index, start, end in _candidates(matcher, rewritten, lo, hi):
+                first = bisect.bisect_right(ends, start)
+                after = bisect.bisect_left(starts, end)
+                # The new text of a match must come from replacements of earlier patterns only
+                if first == after or any(rewrites[n][3] >= (index if rewrites[n][2] is None else
+                                                            min(index, len(replacements)))
+                                         for n in range(first, after)):
+                    continue
+                head, tail = rewrites[first], rewrites[after - 1]
+                prefix = rewritten[starts[first]:start] if head[2] is not None else ""
+                suffix = rewritten[end:ends[after - 1]] if tail[2] is not None else ""
+                # Outside the replacements the text is original, so its offsets only shift
+                orig_start = head[0] if prefix else head[0] + start - starts[first]
+                orig_end = tail[1] if suffix else tail[1] + end - ends[after - 1]
+                if index < len(replacements):
+                    new = [(orig_start, orig_end, prefix + replacements[index] + suffix, index)]
+                elif suffix or (prefix and after == first + 1 and orig_end == head[1]):
+                    continue
+                elif prefix:
+                    # The start of the replacement stays with it and the match keeps its own text
+                    new = [head[:2] + (prefix, head[3]), (head[1], orig_end, rewritten[start:end], index)]
+                else:
+                    new = [(orig_start, orig_end, rewritten[start:end], index)]
+                chained.append((index, start, first, after, new))
+        if not chained:
+            break
+
+        earliest = min(chained)[0]
+        accepted = {}
+        n = 0
+        for index, start, first, after, new in sorted(chained, key=lambda c: c[1]):
+            if index == earliest and first >= n:
+                accepted[first] = (after, new)
+                n = after
+        # Replacements that later patterns matched are scanned again once the earliest are applied
+        retry = set(k for index, _, first, after, _ in chained if index != earliest for k in range(first, after))
+        merged = []
+        fresh = []
+        n = 0
+        while n < len(rewrites):
+            if n in accepted:
+                after, new = accepted[n]
+                if new[-1][3] < len(replacements):
+                    fresh.append(len(merged))
+                merged.extend(new)
+                n = after
+            else:
+                if n in retry:
+                    fresh.append(len(merged))
+                merged.append(rewrites[n])
+                n += 1
+        rewrites = merged
+    return [rewrite for rewrite in rewrites if rewrite[2] is not None]
+
+
+def _split_contractions(text):
+    """Replace simple contractions and locate contextual ones in a single pass over text.
+
+    Returns a list of text pieces, a list of (piece index, contextual pattern index) for each
+    contextual contraction found, whose piece still holds its original form, and the (start, end)
+    offsets in text of every contraction found.  The piece of the nth contraction is at index 2n + 1.
+    """
+    replacements = _tables.simple_replacements
+    pieces = []
+    slots = []
+    spans = []
+    last = 0
+    for start, end, rep, index in _rewrite(_tables.expand_matcher, replacements, text):
+        spans.append((start, end))
+        pieces.append(text[last:start])
+        if index >= len(replacements):
+            slots.append((len(pieces), index - len(replacements)))
+        pieces.append(rep)
+        last = end
+    pieces.append(text[last:])
+    return pieces, slots, spans
+
+
+def _piece_edits(pieces, spans, scores):
+    """Return the (start, end, replacement, score) edit of each contraction split by _split_contractions.
+
+    scores maps the piece index of each contextual contraction to its (errors, distance) score,
+    simple contractions have a score of None.
+    """
+    return [(start, end, pieces[2 * n + 1], scores.get(2 * n + 1)) for n, (start, end) in enumerate(spans)]
+
+
+def apply_edits(text, edits):
+    """Return text with the sorted, non-overlapping (start, end, replacement, score) edits applied."""
+    pieces = []
+    last = 0
+    for start, end, rep, _ in edits:
+        pieces.append(text[last:start])
+        pieces.append(rep)
+        last = end
+    pieces.append(text[last:])
+    return "".join(pieces)
+
+
+def _surface_forms(pattern):
+    """Return the lowercase words a contraction pattern can match, or None if it is not a plain word pattern.
+
+    Only literal characters with optional apostrophes are understood.  Word boundaries and
+    lookarounds only narrow a match so they are dropped.
+    """
+    source = re.sub(r"\(\?<?[=!][^)]*\)", "", pattern.pattern.replace(r"\b", ""))
+    forms = [""]
+    i = 0
+    while i < len(source):
+        char = source[i]
+        if not (char.isalnum() or char == "'"):
+            return None
+        optional = source[i + 1:i + 2] == "?"
+        forms = [form + char for form in forms] + (forms if optional else [])
+        i += 2 if optional else 1
+    return set(form.lower() for form in forms if form)
+
+
+def _candidate_index(patterns):
+    """Precompute every surface form matched by patterns, or None if any of them can't be enumerated."""
+    forms = set()
+    for pattern in patterns:
+        pattern_forms = _surface_forms(pattern)
+        if pattern_forms is None:
+            return None
+        forms.update(pattern_forms)
+    return frozenset(forms)
+
+
+def _has_candidates(text):
+    """Cheaply check whether text may contain a contraction before running the full matcher."""
+    candidates = _tables.expand_candidates
+    if candidates is None:
+        return True
+    text = text.lower()
+    if not candidates.isdisjoint(_word_re.findall(text)):
+        return True
+    # A pattern may also match a run of apostrophe separated parts inside a longer word
+    for word in _apostrophe_word_re.findall(text):
+        parts = word.split("'")
+        for i in range(len(parts)):
+            for j in range(i + 1, len(parts) + 1):
+                if "'".join(parts[i:j]) in candidates:
+                    return True
+    return False
+
+
+def _group_slots(slots):
+    """Group the piece indexes of contextual contractions by pattern, in table order."""
+    groups = {}
+    for pos, index in slots:
+        groups.setdefault(index, []).append(pos)
+    return sorted(groups.items())
+
+
+def _slot_spans(pieces, positions):
+    """Return the (start, end) offsets of the given pieces within the joined text."""
+    offsets = [0]
+    for piece in pieces:
+        offsets.append(offsets[-1] + len(piece))
+    return [(offsets[pos], offsets[pos + 1]) for pos in positions]
+
+
+def _enclosing_token(text, start, end):
+    """Return the bounds of the whitespace separated tokens that text[start:end] is part of."""
+    while start > 0 and not text[start - 1].isspace():
+        start -= 1
+    while end < len(text) and not text[end].isspace():
+        end += 1
+    return start, end
+
+
+def _token_bounds(text, start, end, window):
+    """Return the bounds of text[start:end] widened by window whitespace separated tokens on each side."""
+    lo, hi = start, end
+    for _ in range(window):
+        while lo > 0 and text[lo - 1].isspace():
+            lo -= 1
+        while lo > 0 and not text[lo - 1].isspace():
+            lo -= 1
+    for _ in range(window):
+        while hi < len(text) and text[hi].isspace():
+            hi += 1
+        while hi < len(text) and not text[hi].isspace():
+            hi += 1
+    return lo, hi
+
+
+def _sentence_bounds(text, start, end):
+    """Return the bounds of the sentence containing text[start:end]."""
+    lo = max(text.rfind(char, 0, start) for char in ".!?\n") + 1
+    ends = [text.find(char, end) for char in ".!?\n"]
+    ends = [i for i in ends if i >= 0]
+    hi = min(ends) + 1 if ends else len(text)
+    return lo, hi
+
+
+def _context_bounds(text, spans, window):
+    """Return the merged bounds of the scoring context around each (start, end) span of text.
+
+    window is None for the whole text, 'sentence' for the surrounding sentence or the number of
+    tokens to include on each side.
+    """
+    if window is None:
+        return [(0, len(text))]
+    bounds = []
+    for start, end in spans:
+        if window == 'sentence':
+            lo, hi = _sentence_bounds(text, start, end)
+        else:
+            lo, hi = _token_bounds(text, start, end, window)
+        if bounds and lo <= bounds[-1][1]:
+            bounds[-1] = (bounds[-1][0], max(hi, bounds[-1][1]))
+        else:
+            bounds.append((lo, hi))
+    return bounds
+
+
+def _render(text, bounds, replacements):
+    """Return the text within bounds with the sorted (start, end, rep) replacements applied.
+
+    Separate windows are joined by a blank line so the grammar checker treats them as paragraphs.
+    """
+    windows = []
+    for lo, hi in bounds:
+        parts = []
+        last = lo
+        for start, end, rep in replacements:
+            if lo <= start and end <= hi:
+                parts.append(text[last:start])
+                parts.append(rep)
+                last = end
+        parts.append(text[last:hi])
+        windows.append("".join(parts))
+    return "\n\n".join(windows)
+
+
+def _join_paragraphs(texts):
+    """Join texts as the paragraphs of one document.
+
+    Returns the document with the start and end offset of each text, in the UTF-16 code units
+    LanguageTool reports offsets in.
+    """
+    separator = "\n\n"
+    starts = []
+    ends = []
+    pos = 0
+    for text in texts:
+        length = len(text.encode('utf-16-le')) // 2
+        starts.append(pos)
+        ends.append(pos + length)
+        pos += length + len(separator)
+    return separator.join(texts), starts, ends
+
+
+def _error_offsets(matches):
+    """Return the offsets of LanguageTool matches, leaving out those of _CROSS_PARAGRAPH_RULES."""
+    return [match.offset for match in matches if getattr(match, 'ruleId', None) not in _CROSS_PARAGRAPH_RULES]
+
+
+def _count_errors(offsets, starts, ends):
+    """Return the number of error offsets falling in each text of a document joined by _join_paragraphs."""
+    counts = [0] * len(starts)
+    for offset in offsets:
+        i = bisect.bisect_right(starts, offset) - 1
+        if i >= 0 and offset < ends[i]:
+            counts[i] += 1
+    return counts
+
+
+def _is_language_tool(tool):
+    """Return whether tool is a language_check LanguageTool, without importing language_check."""
+    language_check = sys.modules.get('language_check')
+    return language_check is not None and isinstance(tool, language_check.LanguageTool)
+
+
+def _check_window(window):
+    """Raise an error unless window is None, 'sentence' or a number of tokens."""
+    if window is not None and window != 'sentence' and not (isinstance(window, int) and window >= 0):
+        raise AttributeError("Window must be None, 'sentence' or a number of tokens")
+
+
+def _batches(iterable, size):
+    """Yield lists of up to size consecutive items from iterable."""
+    iterator = iter(iterable)
+    batch = list(islice(iterator, size))
+    while batch:
+        yield batch
+        batch = list(islice(iterator, size))
+
+
+# LanguageTool rules that look across sentences and paragraphs.  In a document of joined hypotheses they
+# would see the other hypotheses, as when three paragraphs start with the same word, so their errors are
+# not counted.
+_CROSS_PARAGRAPH_RULES = ('ENGLISH_WORD_REPEAT_BEGINNING_RULE', 'EN_UNPAIRED_BRACKETS',
+                          'PARAGRAPH_REPEAT_BEGINNING_RULE', 'STYLE_REPEATED_WORD_RULE')
+_word_re = re.compile(r"[\w']+", re.U)
+_apostrophe_word_re = re.compile(r"[\w']*'[\w']*", re.U)
+
+
+class _Tables(object):
+    """The contraction tables along with their replacements, matchers and candidate index, compiled on first use.
+
+    Compiling them costs more than the rest of importing the module, and a process that only
+    contracts texts never needs the expansion ones.
+    """
+
+    def __getattr__(self, name):
+        # Only called until the attribute is set
+        if name == 'simple_contractions':
+            value = _simple_contractions()
+        elif name == 'contextual_contractions':
+            value = _contextual_contractions()
+        elif name == 'expansions':
+            value = _expansions()
+        elif name == 'simple_replacements':
+            value = list(self.simple_contractions.values())
+        elif name == 'contextual_options':
+            value = list(self.contextual_contractions.values())
+        elif name == 'contextual_patterns':
+            value = [pattern.pattern for pattern in self.contextual_contractions]
+        elif name == 'contract_replacements':
+            value = list(self.expansions.values())
+        elif name == 'expand_matcher':
+            value = _compile_matcher(list(self.simple_contractions) + list(self.contextual_contractions))
+        elif name == 'expand_candidates':
+            value = _candidate_index(list(self.simple_contractions) + list(self.contextual_contractions))
+        elif name == 'contract_matcher':
+            value = _compile_matcher(list(self.expansions))
+        else:
+            raise AttributeError(name)
+        setattr(self, name, value)
+        return value
+
+
+_tables = _Tables()
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        # The public tables are compiled on first use as well
+        if name in ('simple_contractions', 'contextual_contractions', 'expansions'):
+            return getattr(_tables, name)
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+else:
+    simple_contractions = _tables.simple_contractions
+    contextual_contractions = _tables.contextual_contractions
+    expansions = _tables.expansions
 
 
 class Contractions(object):
@@ -291,30 +793,128 @@ class Contractions(object):
     Uses a combination of pattern replacement, grammar checking, and Word Mover's Distance.
     """
 
-    def __init__(self, w2v_path=None, lang_code='en-US', kv_model=None, api_key=None):
-        """w2v_path is a path to an embedding model used for calculating the Word Mover's Distance."""
+    def __init__(self, w2v_path=None, lang_code='en-US', kv_model=None, api_key=None, beam_width=3,
+                 cache_size=0, cache_path=None, kv_path=None, scorer='wmd', lc_tool=None,
+                 instrument=False, context_index=None, model_name=None):
+        """w2v_path is a path to an embedding model used for calculating the Word Mover's Distance.
+
+        kv_path is a path to a model in gensim's native keyedvectors format, such as one written by
+        pycontractions.models.convert_model, which is memory mapped rather than read into memory.
+
+        beam_width is the number of partial hypotheses kept per occurrence by the precise method,
+        larger values trade speed for accuracy.
+
+        If cache_size > 0 the scores of up to that many hypotheses are kept in score_cache and reused
+        whenever the same context is scored again, which needs a window in expand_texts to find the
+        same context in different texts.  cache_path is a file the cache is loaded from, if it
+        exists, and written to by save_cache.  The file records the scorer, model_name and lang_code
+        and loading one saved with others raises an error.  model_name defaults to api_key or the
+        file name of kv_path or w2v_path, and for a kv_model to its class and vector size.
+
+        scorer measures the semantic distance of hypotheses.  It is the name of one of
+        pycontractions.scorers.scorers, 'wmd' (the default), 'rwmd' or 'centroid', a Scorer subclass
+        or a Scorer instance.
+
+        lc_tool is used for grammar checking instead of starting a language_check LanguageTool.  It is
+        any object with the check method of LanguageTool returning matches with an offset.  Worker
+        processes get a copy of it, unless it is a LanguageTool in which case they start their own.
+
+        If instrument is True, or an Instrumentation instance to share, the time spent in each stage
+        and counts of matches, hypotheses, grammar checks and cache hits are kept in instrumentation,
+        which also reports a record of each document to its callbacks.
+
+        context_index is a pycontractions.index.ContextIndex, or the path of one it saved, that is
+        consulted before scoring.  Contextual contractions whose neighbouring words it resolves with
+        enough confidence are expanded without grammar checking or semantic scoring.
+        """
+        if beam_width < 1:
+            raise AttributeError("Beam width must be at least 1")
+        self._scorer = None
+        if scorer != 'wmd':
+            # Checking any other scorer imports the scorers and with them NumPy
+            from .scorers import Scorer, scorers
+            if isinstance(scorer, Scorer):
+                self._scorer = scorer
+            elif scorer not in scorers.keys() and not (isinstance(scorer, type) and issubclass(scorer, Scorer)):
+                raise AttributeError("Unknown scorer {}".format(scorer))
         self.w2v_path = w2v_path
         self.lang_code = lang_code
         self.kv_model = kv_model
         self.api_key = api_key
-        self.lc_tool = None
+        self.kv_path = kv_path
+        self.beam_width = beam_width
+        self.scorer = scorer
+        self.lc_tool = lc_tool
+        self.cache_size = cache_size
+        self.cache_path = cache_path
+        if model_name is None:
+            if api_key is not None:
+                model_name = api_key
+            elif kv_path is not None or w2v_path is not None:
+                model_name = os.path.basename(kv_path or w2v_path)
+            elif kv_model is not None:
+                model_name = "{} {}".format(type(kv_model).__name__, getattr(kv_model, 'vector_size', ''))
+        self.model_name = model_name
+        self.score_cache = None
+        self._shared_path = None
+        # The worker pool of expand_texts, kept between calls, and the workers and options it was started with
+        self._pool = None
+        self._pool_setup = None
+        # Scores a worker process added to its cache during the current chunk, sent back to the parent's cache
+        self._added_scores = None
+        self.context_index = context_index
+        if context_index is not None and not hasattr(context_index, 'lookup'):
+            from .index import ContextIndex
+            self.context_index = ContextIndex.load(context_index)
+        self.instrumentation = None
+        if instrument:
+            self.instrumentation = instrument if isinstance(instrument, Instrumentation) else Instrumentation()
+        if cache_size > 0:
+            self.score_cache = ScoreCache(cache_size)
+            if cache_path is not None and os.path.exists(cache_path):
+                self.score_cache.load(cache_path, self._cache_setup())
 
     def load_models(self):
         """Attempt to find/load/download keyedvector model."""
+        self._load_kv_model()
+
+        if self.lc_tool is None:
+            try:
+                import language_check
+                self.lc_tool = language_check.LanguageTool(self.lang_code)
+            except:
+                print("Error initializing LanguageTool")
+                raise
+
+    def _load_kv_model(self):
+        """Attempt to find/load/download keyedvector model without starting LanguageTool."""
         if self.kv_model is not None:
             if not hasattr(self.kv_model, 'wmdistance'):
                 raise AttributeError("Model does not support Word Mover's Distance, must be in keyedvectors format")
 
+        elif self.kv_path is not None:
+            if not os.path.exists(self.kv_path):
+                raise AttributeError("Keyedvectors model not found at {}".format(self.kv_path))
+            try:
+                from gensim.models import KeyedVectors
+                self.kv_model = KeyedVectors.load(self.kv_path, mmap='r')
+                # Workers can map the same files
+                self._shared_path = self.kv_path
+            except:
+                print("Error loading keyedvectors model")
+                raise
         elif self.w2v_path is not None:
             if not os.path.exists(self.w2v_path):
                 raise AttributeError("Word2Vec model not found at {}".format(self.w2v_path))
             try:
+                from gensim.models import KeyedVectors
                 self.kv_model = KeyedVectors.load_word2vec_format(self.w2v_path, binary=True)
             except:
                 print("Error loading Word2Vec model")
                 raise
         elif self.api_key is not None:
             try:
+                import gensim.downloader as api
                 self.kv_model = api.load(self.api_key)
             except:
                 print("Error downloading model {}".format(self.api_key))
@@ -324,85 +924,458 @@ class Contractions(object):
         else:
             raise AttributeError("No model given")
 
-        try:
-            self.lc_tool = language_check.LanguageTool(self.lang_code)
-        except:
-            print("Error initializing LanguageTool")
-            raise
+    def close(self):
+        """Stop the worker processes started by expand_texts, waiting for each to shut down its LanguageTool."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+            self._pool_setup = None
+
+    def _shared_model_path(self):
+        """Return the path of a native format copy of the keyedvector model that workers can memory map."""
+        if self.kv_model is None:
+            self._load_kv_model()
+        if self._shared_path is None:
+            shared_dir = tempfile.mkdtemp(prefix='pycontractions-')
+            atexit.register(shutil.rmtree, shared_dir, True)
+            path = os.path.join(shared_dir, 'vectors.kv')
+            # Store every array in its own file so all of them can be memory mapped
+            self.kv_model.save(path, sep_limit=0)
+            self._shared_path = path
+        return self._shared_path
+
+    def save_cache(self, path=None):
+        """Write the score cache to path, or to the cache_path given to the constructor."""
+        path = path or self.cache_path
+        if self.score_cache is None or path is None:
+            raise AttributeError("No score cache or path to save it to")
+        self.score_cache.save(path, self._cache_setup())
+
+    def _cache_setup(self):
+        """Return the description of how scores are computed that is saved with the score cache."""
+        scorer = self.scorer
+        if isinstance(scorer, type):
+            scorer = scorer.__name__
+        elif hasattr(scorer, 'distances'):
+            scorer = type(scorer).__name__
+        return {'scorer': scorer, 'model': self.model_name, 'lang_code': self.lang_code}
 
-    def _expand_text(self, text, scores=False):
-        """Expand contractions in text using a faster but imprecise method."""
+    def _check_cache_window(self, window):
+        """Warn that the score cache only finds repeated texts when scoring whole texts."""
+        if window is None and self.score_cache is not None:
+            warnings.warn("Without a window the score cache is keyed on whole texts and only hits on repeated "
+                          "texts, pass window='sentence' or a number of tokens to cache local contexts",
+                          stacklevel=3)
+
+    def _grammar_errors(self, texts):
+        """Return the number of grammar errors in each text using a single LanguageTool request.
+
+        The texts are checked as separate paragraphs of one document and each error is attributed
+        to the text its offset falls in.  Errors of rules that look across paragraphs, and so at the
+        other texts, are left out.
+        """
+        document, starts, ends = _join_paragraphs(texts)
+        return _count_errors(_error_offsets(self.lc_tool.check(document)), starts, ends)
+
+    def _lookup_scores(self, pairs):
+        """Return the cache keys of (source, hypothesis) pairs, the cached scores and the missing pairs.
+
+        The missing pairs are those not found in the cache, by key.
+        """
+        keys = [(" ".join(source.split()), " ".join(text1.split())) for source, text1 in pairs]
+        scored = {}
+        missing = {}
+        for key, pair in zip(keys, pairs):
+            # Each distinct key is looked up once, so the cache counts a repeated miss once
+            if key in scored or key in missing:
+                continue
+            score = self.score_cache.get(key) if self.score_cache is not None else None
+            if score is None:
+                missing[key] = pair
+            else:
+                scored[key] = score
+        return keys, scored, missing
+
+    def _semantic_distances(self, missing):
+        """Return the distance of each missing (source, hypothesis) pair by key.
+
+        All hypotheses of a source are scored together.
+        """
+        if self._scorer is None:
+            from .scorers import scorers
+            self._scorer = scorers.get(self.scorer, self.scorer)(self.kv_model)
+        by_source = {}
+        for key, (source, text1) in missing.items():
+            by_source.setdefault(source, []).append((key, text1))
+        distances = {}
+        for source, items in by_source.items():
+            for (key, _), distance in zip(items, self._scorer.distances(source.split(),
+                                                                       [text1.split() for _, text1 in items])):
+                distances[key] = distance
+        return distances
+
+    def _store_scores(self, scored, missing, distances, errors):
+        """Add the scores of the missing pairs to scored and the cache."""
+        for key, (_, text1) in missing.items():
+            scored[key] = (distances[key], errors[text1])
+            if self.score_cache is not None:
+                self.score_cache.put(key, scored[key])
+                if self._added_scores is not None:
+                    self._added_scores.append((key, scored[key]))
+
+    def _score_pairs(self, pairs):
+        """Return the Word Mover's Distance and number of grammar errors for each (source, hypothesis) pair.
+
+        Pairs that are not in the cache are grammar checked together in one request.  The models are
+        loaded on the first score that is not found in the cache.
+        """
+        keys, scored, missing = self._lookup_scores(pairs)
+        timer = null_timer
+        if self.instrumentation is not None:
+            timer = self.instrumentation.timer
+            self.instrumentation.count(cache_hits=len(scored), scored=len(missing), grammar_calls=int(bool(missing)))
+        if missing:
+            if self.lc_tool is None or self.kv_model is None:
+                with timer('load'):
+                    self.load_models()
+            hypotheses = sorted(set(text1 for _, text1 in missing.values()))
+            with timer('grammar'):
+                errors = dict(zip(hypotheses, self._grammar_errors(hypotheses)))
+            with timer('semantic'):
+                distances = self._semantic_distances(missing)
+            self._store_scores(scored, missing, distances, errors)
+        return [scored[key] for key in keys]
+
+    def _resolve_slots(self, text, matches, pieces, index, positions):
+        """Expand the positions of pattern index that the context index resolves and return the rest."""
+        if self.context_index is None:
+            return positions
+        remaining = []
+        for pos in positions:
+            start, end = matches[(pos - 1) // 2]
+            expansion = self.context_index.lookup(text, start, end, index)
+            if expansion is None:
+                remaining.append(pos)
+            else:
+                pieces[pos] = expansion
+        if self.instrumentation is not None:
+            self.instrumentation.count(indexed=len(positions) - len(remaining))
+        return remaining
+
+    def _expand_text(self, text, scores=False, window=None):
+        """Expand contractions in text using a faster but imprecise method.
+
+        This is a generator that yields lists of (source, hypothesis) pairs to score and is sent back
+        their (distance, errors) scores, until it finally yields the (text, intermediates, edits) result.
+        """
         intermediates = []
-        for pattern, rep in simple_contractions.items():
-            text = pattern.sub(rep, text)
-        for pattern, options in contextual_contractions.items():
-            if pattern.search(text):
-                hyp = []
-                for opt in options:
-                    # Assumes all uses of the pattern are the same in one text which doesn't always hold
-                    text1 = pattern.sub(opt, text)
-                    hyp.append((text1, self.kv_model.wmdistance(
-                        text.split(), text1.split()), len(self.lc_tool.check(text1))))
-                hyp = sorted(hyp, key=lambda x: (x[2], x[1]))
-                # The text of the first item is most likely correct
-                text = hyp[0][0]
-                if scores:
-                    intermediates.append(hyp)
-        return (text, intermediates)
-
-    def _expand_text_precise(self, text, scores=False):
-        """Expand contractions in text using a much slower but more precise method."""
+        chosen = {}
+        original = text
+        pieces, slots, matches = _split_contractions(text)
+        for index, positions in _group_slots(slots):
+            positions = self._resolve_slots(original, matches, pieces, index, positions)
+            if not positions:
+                continue
+            options = _tables.contextual_options[index]
+            text = "".join(pieces)
+            spans = _slot_spans(pieces, positions)
+            bounds = _context_bounds(text, spans, window)
+            source = _render(text, bounds, [])
+            # Assumes all uses of the pattern are the same in one text which doesn't always hold
+            texts1 = [_render(text, bounds, [(start, end, opt) for start, end in spans]) for opt in options]
+            scored = yield [(source, text1) for text1 in texts1]
+            hyp = [(text1,) + score for text1, score in zip(texts1, scored)]
+            # The hypothesis that sorts first is most likely correct
+            best = min(range(len(hyp)), key=lambda i: (hyp[i][2], hyp[i][1]))
+            for pos in positions:
+                pieces[pos] = options[best]
+                chosen[pos] = (hyp[best][2], hyp[best][1])
+            if scores:
+                intermediates.append(sorted(hyp, key=lambda x: (x[2], x[1])))
+        yield ("".join(pieces), intermediates, _piece_edits(pieces, matches, chosen))
+
+    def _expand_text_precise(self, text, scores=False, window=None):
+        """Expand contractions in text using a slower but more precise method.
+
+        Each occurrence of a contextual contraction is decided in turn with a beam search, keeping
+        the best beam_width partial hypotheses, so the number of hypotheses scored grows linearly
+        with the number of occurrences.  When scoring on a window the scores of each step are summed.
+        With scores the intermediates of each contraction are only the hypotheses of its last step, sorted
+        best first, as the partial hypotheses of earlier steps are dropped from the beam as it goes.
+        This is a generator driven like _expand_text.
+        """
         intermediates = []
-        for pattern, rep in simple_contractions.items():
-            text = pattern.sub(rep, text)
-        for pattern, options in contextual_contractions.items():
-            num_matches = len(pattern.findall(text))
-            if num_matches > 0:
+        chosen = {}
+        original = text
+        pieces, slots, matches = _split_contractions(text)
+        for index, positions in _group_slots(slots):
+            positions = self._resolve_slots(original, matches, pieces, index, positions)
+            if not positions:
+                continue
+            text = "".join(pieces)
+            spans = _slot_spans(pieces, positions)
+            # Each partial hypothesis keeps its choices, the score of the step that made each choice and
+            # its total score
+            beam = [((), (), 0, 0.0)]
+            for step in range(len(positions)):
+                bounds = _context_bounds(text, spans[step:step + 1], window)
+                source = _render(text, bounds, [])
+                candidates = []
+                for choice, decided, errors, distance in beam:
+                    for opt in _tables.contextual_options[index]:
+                        # Occurrences after this one are left contracted until their turn
+                        choice1 = choice + (opt,)
+                        text1 = _render(text, bounds, [(start, end, rep) for (start, end), rep in zip(spans, choice1)])
+                        candidates.append((choice1, decided, text1, errors, distance))
+                scored = yield [(source, text1) for _, _, text1, _, _ in candidates]
                 hyp = []
-                # If n = len(options) and m = num_matches:
-                # This performs (n+m-1)! / m! / (n-1)! total iterations
-                for perm_set in (set(permutations(comb)) for comb in combinations_with_replacement(options,
-                                                                                                   num_matches)):
-                    # This performs sum(n * m! / (m-x)! * (x+1) for x in range(m)) total iterations
-                    for perm in perm_set:
-                        text1 = text
-                        # This performs sum(n * m! / (m-x)! * (x+1) for x in range(m)) * m total iterations
-                        for opt in perm:
-                            text1 = pattern.sub(opt, text1, count=1)
-                        hyp.append((text1, self.kv_model.wmdistance(
-                                    text.split(), text1.split()), len(self.lc_tool.check(text1))))
-                hyp = sorted(hyp, key=lambda x: (x[2], x[1]))
-                # The text of the first item is most likely correct
-                text = hyp[0][0]
-                if scores:
-                    intermediates.append(hyp)
-        return (text, intermediates)
-
-    def expand_texts(self, texts, precise=False, scores=False):
+                choices = []
+                for (choice1, decided, text1, errors, distance), (distance1, errors1) in zip(candidates, scored):
+                    decided1 = decided + ((errors1, distance1),)
+                    if window is not None:
+                        distance1 += distance
+                        errors1 += errors
+                    hyp.append((text1, distance1, errors1))
+                    choices.append((choice1, decided1, errors1, distance1))
+                order = sorted(range(len(hyp)), key=lambda i: (hyp[i][2], hyp[i][1]))
+                beam = [choices[i] for i in order[:self.beam_width]]
+            # The hypothesis that sorts first is most likely correct
+            for pos, rep, score in zip(positions, beam[0][0], beam[0][1]):
+                pieces[pos] = rep
+                chosen[pos] = score
+            if scores:
+                intermediates.append([hyp[i] for i in order])
+        yield ("".join(pieces), intermediates, _piece_edits(pieces, matches, chosen))
+
+    def _expand_batch(self, texts, precise=False, scores=False, window=None):
+        """Expand a list of texts in lockstep, returning a (text, intermediates, edits) tuple for each.
+
+        Every round the pending hypotheses of all texts are scored together, so there is one
+        grammar check request per round rather than one per hypothesis.
+        """
+        if precise:
+            _fn = self._expand_text_precise
+        else:
+            _fn = self._expand_text
+
+        stats = self.instrumentation
+        records = [stats.document(text) for text in texts] if stats is not None else None
+        results = [(text, [], []) for text in texts]
+        pending = []
+        for i, text in enumerate(texts):
+            if _has_candidates(text):
+                steps = _fn(text, scores, window)
+                if stats is None:
+                    pending.append((i, steps, next(steps)))
+                else:
+                    pending.append((i, steps, stats.step(records[i], steps, None)))
+        while pending:
+            waiting = []
+            for i, steps, request in pending:
+                if isinstance(request, tuple):
+                    results[i] = request
+                    if stats is not None:
+                        # There is an edit for every contraction found
+                        records[i]['matches'] = len(request[2])
+                else:
+                    waiting.append((i, steps, request))
+            pairs = [pair for _, _, request in waiting for pair in request]
+            if stats is None:
+                scored = self._score_pairs(pairs)
+            else:
+                scored = stats.score_round(self._score_pairs, pairs,
+                                           [(records[i], len(request)) for i, _, request in waiting])
+            pending = []
+            pos = 0
+            for i, steps, request in waiting:
+                if stats is None:
+                    pending.append((i, steps, steps.send(scored[pos:pos + len(request)])))
+                else:
+                    pending.append((i, steps, stats.step(records[i], steps, scored[pos:pos + len(request)])))
+                pos += len(request)
+        if stats is not None:
+            for record in records:
+                stats.finish(record)
+        return results
+
+    def _expand_parallel(self, texts, precise, scores, window, batch_size, workers, chunksize):
+        """Expand texts in chunks of chunksize across a pool of worker processes, in order.
+
+        The workers memory map one shared copy of the keyedvector model and each starts its own
+        LanguageTool unless lc_tool was given.  The pool is kept for later calls with the same number
+        of workers until close is called.  At most two chunks per worker are in flight so texts are
+        read lazily.
+        """
+        import multiprocessing
+        from .scorers import Scorer
+
+        # A scorer instance holds the model, so workers create their own of the same class
+        options = {'lang_code': self.lang_code, 'beam_width': self.beam_width, 'cache_size': self.cache_size,
+                   'cache_path': self.cache_path,
+                   'scorer': type(self.scorer) if isinstance(self.scorer, Scorer) else self.scorer,
+                   'instrument': self.instrumentation is not None,
+                   'lc_tool': None if _is_language_tool(self.lc_tool) else self.lc_tool,
+                   'context_index': self.context_index, 'model_name': self.model_name}
+        if self._pool_setup != (workers, options):
+            self.close()
+            self._pool = multiprocessing.Pool(workers, _init_worker, (self._shared_model_path(), options))
+            self._pool_setup = (workers, options)
+        pool = self._pool
+        try:
+            pending = deque()
+            for chunk in _batches(texts, chunksize):
+                pending.append(pool.apply_async(_expand_chunk, ((chunk, precise, scores, window, batch_size),)))
+                if len(pending) >= 2 * workers:
+                    for result in self._chunk_results(pending.popleft().get()):
+                        yield result
+            while pending:
+                for result in self._chunk_results(pending.popleft().get()):
+                    yield result
+        except Exception:
+            # The workers may be stuck or broken, so they are killed without shutting down cleanly
+            pool.terminate()
+            self._pool = None
+            self._pool_setup = None
+            raise
+
+    def _chunk_results(self, chunk):
+        """Return the results of a chunk expanded by a worker, merging its instrumentation and cache."""
+        results, snapshot, records, cache = chunk
+        if self.instrumentation is not None:
+            self.instrumentation.merge(snapshot, records)
+        if self.score_cache is not None and cache is not None:
+            added, hits, misses = cache
+            for key, score in added:
+                self.score_cache.put(key, score)
+            self.score_cache.hits += hits
+            self.score_cache.misses += misses
+        return results
+
+    def expand_texts(self, texts, precise=False, scores=False, window=None, batch_size=1, workers=1,
+                     chunksize=16, edits=False):
         """Return a generator over an iterable of text where each result has common contractions expanded.
 
-        If precise == True then it will use a much slower method that does not assume all occurrences
+        If precise == True then it will use a slower method that does not assume all occurrences
         of the same contraction in the text have the same expansion.  If scores == True, it will return
         a generator over a list of lists of intermediate results with their scores and number of grammar errors.
+        With precise == True each list holds only the hypotheses of the last step of the beam search of
+        that contraction, in which all its occurrences are decided, rather than every combination.
+
+        By default every hypothesis is scored on the whole text.  If window == 'sentence' each contraction
+        is scored on its surrounding sentence instead, and if window is a number on that many tokens either
+        side of it, so the cost of scoring no longer depends on the length of the text.  The intermediate
+        results then hold the scored windows rather than the whole text.
+
+        Texts are read batch_size at a time and the hypotheses of a whole batch are grammar checked
+        together, which saves round trips to LanguageTool at the cost of reading ahead in texts.
+
+        If workers > 1 the texts are sent in chunks of chunksize to that many worker processes,
+        which share one memory mapped copy of the keyedvector model.  Results are still yielded
+        in the order of texts.  The workers are kept for the next call until close is called.
+        The scores the workers cache are added to score_cache as their chunks come back.
+
+        Texts without any contraction are passed through untouched, and the models are only loaded
+        once a text needs a contextual contraction scored.
+
+        If edits == True, it will instead return a generator over a list of (start, end, replacement, score)
+        edits for each text, with offsets into the original text.  score is None for contractions with a
+        single expansion or resolved by the context index.  Otherwise it is the (errors, distance) of the
+        hypothesis that decided the contraction: with precise == True the hypothesis of the beam step that
+        chose it, and otherwise the one that chose the expansion of every occurrence of its contraction
+        together.  apply_edits builds the expanded text from them.
         """
-        if self.lc_tool is None:
-            self.load_models()
+        _check_window(window)
+        self._check_cache_window(window)
 
-        if precise:
-            _fn = self._expand_text_precise
+        if workers > 1:
+            results = self._expand_parallel(texts, precise, scores, window, batch_size, workers, chunksize)
         else:
-            _fn = self._expand_text
+            results = (result for batch in _batches(texts, batch_size)
+                       for result in self._expand_batch(batch, precise, scores, window))
 
-        for text in texts:
-            text, intermediates = _fn(text, scores)
-            if scores:
+        for text, intermediates, text_edits in results:
+            if edits:
+                yield text_edits
+            elif scores:
                 yield intermediates
             else:
                 yield text
 
-    def contract_texts(self, texts):
-        """Return a generator over an iterable of text where each result has contracted common expansions."""
+    def contract_texts(self, texts, edits=False):
+        """Return a generator over an iterable of text where each result has contracted common expansions.
+
+        If edits == True, it will instead return a generator over a list of (start, end, replacement, None)
+        edits for each text, with offsets into the original text.
+        """
+        stats = self.instrumentation
+        matcher = _tables.contract_matcher
+        replacements = _tables.contract_replacements
         for text in texts:
-            for pattern, rep in expansions.items():
-                text = pattern.sub(rep, text)
-            yield text
+            if stats is not None:
+                record = stats.document(text)
+                start_time = default_timer()
+            matches = _rewrite(matcher, replacements, text)
+            if edits:
+                result = [(start, end, rep, None) for start, end, rep, _ in matches]
+            else:
+                result = apply_edits(text, matches)
+            if stats is not None:
+                record['scan'] = default_timer() - start_time
+                record['matches'] = len(matches)
+                stats.finish(record)
+            yield result
+
+
+# The Contractions instance of a worker process started by Contractions.expand_texts
+_worker = None
+# Instrumentation records of the documents of the current chunk of a worker process
+_worker_records = []
+
+
+def _init_worker(kv_path, options):
+    """Create the Contractions instance of a worker process from a memory mapped keyedvector model."""
+    global _worker
+    from gensim.models import KeyedVectors
+    _worker = Contractions(kv_model=KeyedVectors.load(kv_path, mmap='r'), **options)
+    if _worker.instrumentation is not None:
+        _worker.instrumentation.add_callback(_worker_records.append)
+    if _worker.score_cache is not None:
+        _worker._added_scores = []
+    # atexit hooks, such as the one of language_check stopping its server, don't run in pool workers
+    from multiprocessing.util import Finalize
+    Finalize(None, _stop_language_tool, exitpriority=10)
+
+
+def _stop_language_tool():
+    """Stop the LanguageTool server language_check started in this process, if any."""
+    language_check = sys.modules.get('language_check')
+    if language_check is not None and hasattr(language_check, 'terminate_server'):
+        language_check.terminate_server()
+
+
+def _expand_chunk(args):
+    """Expand a chunk of texts in a worker process.
+
+    Returns a (text, intermediates, edits) tuple for each text along with the worker's instrumentation
+    snapshot and records for the chunk, which are None and empty when it is disabled, and the
+    (scores added, hits, misses) of its score cache during the chunk, None without a cache.
+    """
+    texts, precise, scores, window, batch_size = args
+    score_cache = _worker.score_cache
+    if score_cache is not None:
+        hits, misses = score_cache.hits, score_cache.misses
+    results = [result for batch in _batches(texts, batch_size)
+               for result in _worker._expand_batch(batch, precise, scores, window)]
+    cache = None
+    if score_cache is not None:
+        cache = (list(_worker._added_scores), score_cache.hits - hits, score_cache.misses - misses)
+        del _worker._added_scores[:]
+    stats = _worker.instrumentation
+    if stats is None:
+        return results, None, [], cache
+    snapshot = stats.snapshot()
+    records = list(_worker_records)
+    stats.reset()
+    del _worker_records[:]
+    return results, snapshot, records, cache
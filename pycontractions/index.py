@@ -0,0 +1,165 @@
+from __future__ import division, print_function, unicode_literals
+
+import argparse
+from collections import deque
+from .contractions import Contractions, _split_contractions, _tables, _word_re
+import io
+import json
+
+# Characters of text searched for each context word, enough for all but the longest words
+_CHARS_PER_WORD = 64
+
+
+def _contexts(text, start, end, ngram):
+    """Return the (side, words) contexts of text[start:end], longest first and the right side before the left."""
+    left = [word.lower() for word in _word_re.findall(text[max(0, start - _CHARS_PER_WORD * ngram):start])]
+    right = [word.lower() for word in _word_re.findall(text[end:end + _CHARS_PER_WORD * ngram])]
+    contexts = []
+    for size in range(ngram, 0, -1):
+        if len(right) >= size:
+            contexts.append(('right', " ".join(right[:size])))
+        if len(left) >= size:
+            contexts.append(('left', " ".join(left[-size:])))
+    return contexts
+
+
+class ContextIndex(object):
+    """Lookup of the expansion of contextual contractions from the words next to them.
+
+    The index is built by expanding a representative corpus with the full grammar and semantic
+    scoring and counting, for each contraction and each of the ngram words to its right and to its
+    left, how often every expansion was chosen.  An expansion is looked up from the longest context
+    first, right before left, and only used if it was chosen in at least min_confidence of at least
+    min_support occurrences of that context, so expand_texts falls back to scoring otherwise.
+    """
+
+    def __init__(self, ngram=2, min_confidence=0.95, min_support=5):
+        """ngram is the largest number of words on either side used as context."""
+        if ngram < 1:
+            raise AttributeError("ngram must be at least 1")
+        self.ngram = ngram
+        self.min_confidence = min_confidence
+        self.min_support = min_support
+        # (pattern, side, words) -> {expansion: count}
+        self._counts = {}
+        # (pattern, side, words) -> (expansion, confidence, support)
+        self._best = {}
+
+    def __len__(self):
+        return len(self._counts)
+
+    def add(self, text, start, end, index, expansion):
+        """Count expansion as chosen for the contextual contraction text[start:end] of pattern index."""
+        pattern = _tables.contextual_patterns[index]
+        for side, words in _contexts(text, start, end, self.ngram):
+            key = (pattern, side, words)
+            counts = self._counts.setdefault(key, {})
+            counts[expansion] = counts.get(expansion, 0) + 1
+            self._best.pop(key, None)
+
+    def build(self, cont, texts, **options):
+        """Add the expansions cont chooses for the contextual contractions of texts.
+
+        options are passed to cont.expand_texts, for example precise=True or workers=8.  cont
+        should not use a context index itself.
+        """
+        # Texts waiting for their edits, bounded by how far expand_texts reads ahead
+        pending = deque()
+
+        def read():
+            for text in texts:
+                pending.append(text)
+                yield text
+
+        for edits in cont.expand_texts(read(), edits=True, **options):
+            text = pending.popleft()
+            _, slots, spans = _split_contractions(text)
+            for pos, index in slots:
+                # Every contraction found has an edit, in the same order as its span
+                n = (pos - 1) // 2
+                self.add(text, spans[n][0], spans[n][1], index, edits[n][2])
+        return self
+
+    def _entry(self, key):
+        """Return the (expansion, confidence, support) of key, or None if it was never seen."""
+        best = self._best.get(key)
+        if best is None:
+            counts = self._counts.get(key)
+            if counts is None:
+                return None
+            support = sum(counts.values())
+            expansion = max(sorted(counts), key=counts.get)
+            best = self._best[key] = (expansion, counts[expansion] / support, support)
+        return best
+
+    def lookup(self, text, start, end, index):
+        """Return the expansion of the contextual contraction text[start:end] of pattern index, or None.
+
+        None means no context of the contraction was seen often enough or decided consistently enough.
+        """
+        pattern = _tables.contextual_patterns[index]
+        for side, words in _contexts(text, start, end, self.ngram):
+            entry = self._entry((pattern, side, words))
+            if entry is not None and entry[2] >= self.min_support and entry[1] >= self.min_confidence:
+                # An index built from other tables may hold expansions these don't have
+                if entry[0] in _tables.contextual_options[index]:
+                    return entry[0]
+        return None
+
+    def save(self, path):
+        """Write the entries seen at least min_support times to a JSON file at path, returning their number."""
+        entries = []
+        for key in sorted(self._counts):
+            expansion, confidence, support = self._entry(key)
+            if support >= self.min_support:
+                entries.append(list(key) + [expansion, confidence, self._counts[key]])
+        with io.open(path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'ngram': self.ngram, 'min_confidence': self.min_confidence,
+                                'min_support': self.min_support, 'entries': entries}, ensure_ascii=False))
+        return len(entries)
+
+    @classmethod
+    def load(cls, path, min_confidence=None, min_support=None):
+        """Return the index saved to a JSON file at path, with the thresholds it was saved with unless given."""
+        with io.open(path, encoding='utf-8') as f:
+            data = json.loads(f.read())
+        if min_confidence is None:
+            min_confidence = data['min_confidence']
+        if min_support is None:
+            min_support = data['min_support']
+        index = cls(data['ngram'], min_confidence, min_support)
+        for pattern, side, words, _, _, counts in data['entries']:
+            index._counts[(pattern, side, words)] = counts
+        return index
+
+
+def main():
+    """Build a context index from the command line."""
+    parser = argparse.ArgumentParser(description="Build a context index of the expansions chosen for a corpus.")
+    parser.add_argument('corpus', help="file of texts, one per line")
+    parser.add_argument('target', help="path to write the index to")
+    parser.add_argument('--ngram', type=int, default=2, help="largest number of context words on each side")
+    parser.add_argument('--min-support', type=int, default=5, help="occurrences a context needs to be saved")
+    parser.add_argument('--precise', action='store_true', help="use the precise method")
+    parser.add_argument('--window', help="scoring window, 'sentence' or a number of tokens")
+    parser.add_argument('--batch-size', type=int, default=64, help="texts grammar checked together")
+    parser.add_argument('--workers', type=int, default=1, help="worker processes")
+    parser.add_argument('--w2v-path', help="word2vec binary model")
+    parser.add_argument('--kv-path', help="native keyedvectors model")
+    parser.add_argument('--api-key', help="gensim.downloader model")
+    parser.add_argument('--lang', default='en-US', help="LanguageTool language code")
+    args = parser.parse_args()
+
+    window = args.window
+    if window is not None and window != 'sentence':
+        window = int(window)
+    cont = Contractions(w2v_path=args.w2v_path, lang_code=args.lang, api_key=args.api_key, kv_path=args.kv_path)
+    index = ContextIndex(args.ngram, min_support=args.min_support)
+    with io.open(args.corpus, encoding='utf-8') as f:
+        index.build(cont, (line.rstrip("\r\n") for line in f), precise=args.precise, window=window,
+                    batch_size=args.batch_size, workers=args.workers)
+    print("Wrote {} contexts to {}".format(index.save(args.target), args.target))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+from __future__ import division, unicode_literals
+
+from contextlib import contextmanager
+from timeit import default_timer
+
+# Stages timed: finding contractions and building hypotheses, LanguageTool, the semantic scorer and model loading
+STAGES = ('scan', 'grammar', 'semantic', 'load')
+# Totals kept: documents, contractions matched, hypotheses and scoring rounds generated, scores taken from
+# the cache, scores computed by the models, requests sent to LanguageTool and contractions resolved by the
+# context index
+COUNTERS = ('documents', 'matches', 'hypotheses', 'rounds', 'cache_hits', 'scored', 'grammar_calls', 'indexed')
+
+
+@contextmanager
+def null_timer(stage):
+    """Stand-in for Instrumentation.timer when instrumentation is disabled."""
+    yield
+
+
+class Instrumentation(object):
+    """Cumulative timers and counters of the stages of expanding and contracting texts.
+
+    Each document processed by expand_texts or contract_texts also gets a record, a dict of the
+    time it spent in the scan, grammar and semantic stages along with its length, matches,
+    hypotheses and rounds, which is passed to every callback once the document is done.  When
+    texts are scored in batches the grammar and semantic time of a round is split among the
+    documents in proportion to the hypotheses they contributed.  Records and totals of worker
+    processes are merged in the order of the texts.
+    """
+
+    def __init__(self, callback=None):
+        """callback, if given, is called with the record of each document."""
+        self.callbacks = [] if callback is None else [callback]
+        self.reset()
+
+    def reset(self):
+        """Set all timers and counters to zero."""
+        self.timers = dict.fromkeys(STAGES, 0.0)
+        self.counters = dict.fromkeys(COUNTERS, 0)
+
+    def add_callback(self, callback):
+        """Call callback with the record of each document from now on."""
+        self.callbacks.append(callback)
+
+    def snapshot(self):
+        """Return a dict of copies of the timers and counters."""
+        return {'timers': dict(self.timers), 'counters': dict(self.counters)}
+
+    def merge(self, snapshot, records=()):
+        """Add the totals of a snapshot, such as one taken in a worker process, and report its records."""
+        for stage, elapsed in snapshot['timers'].items():
+            self.timers[stage] += elapsed
+        for name, count in snapshot['counters'].items():
+            self.counters[name] += count
+        for record in records:
+            self._report(record)
+
+    def count(self, **counts):
+        """Add to counters by name."""
+        for name, count in counts.items():
+            self.counters[name] += count
+
+    @contextmanager
+    def timer(self, stage):
+        """Add the time spent in the with block to the timer of stage."""
+        start = default_timer()
+        try:
+            yield
+        finally:
+            self.timers[stage] += default_timer() - start
+
+    def document(self, text):
+        """Return a new record for a document."""
+        return {'length': len(text), 'matches': 0, 'hypotheses': 0, 'rounds': 0,
+                'scan': 0.0, 'grammar': 0.0, 'semantic': 0.0}
+
+    def step(self, record, steps, scored):
+        """Send scored to an expansion generator, timing it as the scan stage of record, and return its request."""
+        start = default_timer()
+        request = steps.send(scored)
+        record['scan'] += default_timer() - start
+        if not isinstance(request, tuple):
+            record['hypotheses'] += len(request)
+            record['rounds'] += 1
+        return request
+
+    def score_round(self, score, pairs, shares):
+        """Return score(pairs), splitting its grammar and semantic time among (record, number of pairs) shares."""
+        grammar = self.timers['grammar']
+        semantic = self.timers['semantic']
+        scored = score(pairs)
+        if pairs:
+            grammar = (self.timers['grammar'] - grammar) / len(pairs)
+            semantic = (self.timers['semantic'] - semantic) / len(pairs)
+            for record, count in shares:
+                record['grammar'] += grammar * count
+                record['semantic'] += semantic * count
+        return scored
+
+    def finish(self, record):
+        """Add a finished document's record to the totals and report it."""
+        self.timers['scan'] += record['scan']
+        self.count(documents=1, matches=record['matches'], hypotheses=record['hypotheses'], rounds=record['rounds'])
+        self._report(record)
+
+    def _report(self, record):
+        for callback in self.callbacks:
+            callback(record)
@@ -0,0 +1,116 @@
+from __future__ import unicode_literals
+
+import argparse
+from .contractions import _enclosing_token, _render, _slot_spans, _split_contractions, _tables
+import io
+from itertools import product
+
+
+def table_vocabulary():
+    """Return the set of words appearing in the contraction tables, both contracted and expanded."""
+    words = set(_tables.expand_candidates or ())
+    for rep in _tables.simple_contractions.values():
+        words.update(rep.split())
+    for options in _tables.contextual_contractions.values():
+        for opt in options:
+            words.update(opt.split())
+    for rep in _tables.expansions.values():
+        words.add(rep)
+    return words
+
+
+def _token_parts(token):
+    """Return the parts of a token that a sentence window can cut it into, after any of .!?"""
+    cuts = [0] + [i + 1 for i, char in enumerate(token[:-1]) if char in ".!?"] + [len(token)]
+    return set(token[lo:hi] for i, lo in enumerate(cuts) for hi in cuts[i + 1:])
+
+
+def corpus_vocabulary(texts):
+    """Return the set of tokens that expanding texts can pass to the embedding model.
+
+    This covers the tokens of each text with its simple contractions expanded, as well as every
+    token of the whitespace separated token around each contextual contraction with any of its
+    expansions, or none, in place of every contraction in it.  Tokens are also cut where a
+    sentence window can end inside them.
+    """
+    words = set()
+    for text in texts:
+        pieces, slots, _ = _split_contractions(text)
+        text = "".join(pieces)
+        tokens = text.split()
+        spans = _slot_spans(pieces, [pos for pos, _ in slots])
+        around = {}
+        for (start, end), (_, index) in zip(spans, slots):
+            around.setdefault(_enclosing_token(text, start, end), []).append((start, end, index))
+        for bounds, contractions in around.items():
+            options = [[text[start:end]] + _tables.contextual_options[index] for start, end, index in contractions]
+            for choice in product(*options):
+                replacements = [(start, end, rep) for (start, end, _), rep in zip(contractions, choice)]
+                tokens.extend(_render(text, [bounds], replacements).split())
+        for token in tokens:
+            words.update(_token_parts(token))
+    return words
+
+
+def _model_words(model):
+    """Return the words of a keyedvectors model in index order, across gensim versions."""
+    words = getattr(model, 'index_to_key', None)
+    if words is None:
+        words = model.index2word
+    return words
+
+
+def convert_model(source, target, vocab=None, binary=True):
+    """Write an embedding model in gensim's native keyedvectors format for fast memory mapped loading.
+
+    source is a path to a model in word2vec format, binary unless binary == False, or a keyedvectors
+    model such as one from the gensim.downloader api.  If vocab is given the model is pruned to the
+    words in vocab and the contraction tables, ignoring case, which keeps the Word Mover's Distance
+    of any text whose tokens are all in vocab unchanged.  Load the result with Contractions(kv_path=target).
+    """
+    from gensim.models import KeyedVectors
+
+    if hasattr(source, 'wmdistance'):
+        model = source
+    else:
+        model = KeyedVectors.load_word2vec_format(source, binary=binary)
+
+    if vocab is not None:
+        keep = set(word.lower() for word in table_vocabulary())
+        keep.update(word.lower() for word in vocab)
+        keys = [key for key in _model_words(model) if key.lower() in keep]
+        pruned = KeyedVectors(model.vector_size)
+        add = getattr(pruned, 'add_vectors', None) or pruned.add
+        add(keys, model[keys])
+        model = pruned
+
+    # Store every array in its own file so all of them can be memory mapped
+    model.save(target, sep_limit=0)
+    return model
+
+
+def main():
+    """Convert a word2vec model from the command line."""
+    parser = argparse.ArgumentParser(description=convert_model.__doc__.split("\n")[0])
+    parser.add_argument('source', help="model in word2vec format")
+    parser.add_argument('target', help="path to write the native format model to")
+    parser.add_argument('--text', action='store_true', help="the source model is in text rather than binary format")
+    parser.add_argument('--vocab', help="file of words to keep, one per line")
+    parser.add_argument('--corpus', help="file of texts, one per line, whose vocabulary to keep")
+    args = parser.parse_args()
+
+    vocab = None
+    if args.vocab is not None or args.corpus is not None:
+        vocab = set()
+    if args.vocab is not None:
+        with io.open(args.vocab, encoding='utf-8') as f:
+            vocab.update(line.strip() for line in f if line.strip())
+    if args.corpus is not None:
+        with io.open(args.corpus, encoding='utf-8') as f:
+            vocab.update(corpus_vocabulary(f))
+    model = convert_model(args.source, args.target, vocab, binary=not args.text)
+    print("Wrote {} words to {}".format(len(_model_words(model)), args.target))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+from __future__ import division, unicode_literals
+
+import numpy as np
+
+
+class Scorer(object):
+    """Measure how far hypotheses moved from their source text in a keyedvectors embedding space.
+
+    Subclasses implement distances, which scores every hypothesis of a source at once.  Lower
+    distances rank first among hypotheses with the same number of grammar errors.
+    """
+
+    def __init__(self, kv_model):
+        self.kv_model = kv_model
+
+    def distances(self, source, hypotheses):
+        """Return the distance from the source token list to each hypothesis token list."""
+        raise NotImplementedError
+
+    def _in_vocabulary(self, tokens):
+        """Return the tokens that have a vector in the model."""
+        return [token for token in tokens if token in self.kv_model]
+
+    def _vectors(self, words):
+        """Return the vectors wmdistance uses for words, normalized in gensim >= 4."""
+        if hasattr(self.kv_model, 'key_to_index'):
+            return np.array([self.kv_model.get_vector(word, norm=True) for word in words])
+        return np.array([self.kv_model[word] for word in words])
+
+    def _bags(self, docs, normalized=False):
+        """Return the words of docs, their vectors and a matrix of each doc's normalized word frequencies.
+
+        If normalized the vectors are the ones wmdistance uses rather than the raw vectors of the model.
+        """
+        index = {}
+        words = []
+        for doc in docs:
+            for word in doc:
+                if word not in index:
+                    index[word] = len(words)
+                    words.append(word)
+        weights = np.zeros((len(docs), len(words)))
+        for row, doc in enumerate(docs):
+            for word in doc:
+                weights[row, index[word]] += 1
+            if doc:
+                weights[row] /= len(doc)
+        if not words:
+            vectors = np.zeros((0, 0))
+        elif normalized:
+            vectors = self._vectors(words)
+        else:
+            vectors = self.kv_model[words]
+        return words, np.asarray(vectors, dtype=np.double), weights
+
+
+class WMDScorer(Scorer):
+    """Word Mover's Distance, the default scorer.
+
+    For gensim keyedvectors the vectors of the source and the distances between its words are
+    computed once, and each hypothesis only adds the distances of the words it introduces before
+    solving the transport problem.  This reproduces gensim's wmdistance exactly, following the
+    pyemd based computation of gensim < 4 or the POT based one of gensim >= 4.  Any other model
+    is scored by its own wmdistance.
+    """
+
+    def __init__(self, kv_model):
+        super(WMDScorer, self).__init__(kv_model)
+        self._source = None
+        if hasattr(kv_model, 'key_to_index'):
+            self._flavor = 'pot'
+        elif hasattr(kv_model, 'index2word'):
+            self._flavor = 'pyemd'
+        else:
+            self._flavor = None
+
+    def distances(self, source, hypotheses):
+        if self._flavor is None:
+            return [self.kv_model.wmdistance(source, hypothesis) for hypothesis in hypotheses]
+        # The same source is often scored again by the next beam step
+        prepared = self._source
+        if prepared is None or prepared[0] != source:
+            prepared = (list(source), self._prepare(source))
+            self._source = prepared
+        return [self._distance(prepared[1], hypothesis) for hypothesis in hypotheses]
+
+    def _pairwise(self, vectors1, vectors2):
+        """Return the Euclidean distances between two sets of vectors as wmdistance computes them."""
+        if self._flavor == 'pot':
+            from scipy.spatial.distance import cdist
+            return cdist(vectors1, vectors2)
+        distances = np.zeros((len(vectors1), len(vectors2)), dtype=np.double)
+        for j, vector in enumerate(vectors2):
+            distances[:, j] = np.sqrt(np.sum((vectors1 - vector) ** 2, axis=1))
+        return distances
+
+    def _prepare(self, source):
+        """Return the in vocabulary tokens of source, its sorted unique words and their pairwise distances."""
+        document = self._in_vocabulary(source)
+        words = sorted(set(document))
+        if not words:
+            return document, words, None, None
+        vectors = self._vectors(words)
+        return document, words, vectors, self._pairwise(vectors, vectors)
+
+    def _distance(self, prepared, hypothesis):
+        """Return the Word Mover's Distance from a prepared source to a hypothesis token list."""
+        document1, words1, vectors1, distances1 = prepared
+        document2 = self._in_vocabulary(hypothesis)
+        if not document1 or not document2:
+            return float('inf')
+
+        # Word ids are assigned like a gensim Dictionary of the two documents
+        known = set(words1)
+        words = words1 + sorted(set(word for word in document2 if word not in known))
+        if len(words) == 1:
+            return 0.0
+        size = len(words1)
+        index = dict((word, i) for i, word in enumerate(words))
+        in2 = np.zeros(len(words), dtype=bool)
+        in2[[index[word] for word in set(document2)]] = True
+
+        distance_matrix = np.zeros((len(words), len(words)), dtype=np.double)
+        added = self._pairwise(vectors1, self._vectors(words[size:])) if len(words) > size else None
+        if self._flavor == 'pot':
+            # Only rows of the source and columns of the hypothesis are filled
+            distance_matrix[:size, :size] = distances1 * in2[None, :size]
+            if added is not None:
+                distance_matrix[:size, size:] = added
+            if abs(np.sum(distance_matrix)) < 1e-8:
+                return float('inf')
+        else:
+            # Filled symmetrically for every pair of a source and a hypothesis word
+            distance_matrix[:size, :size] = distances1 * (in2[None, :size] | in2[:size, None])
+            if added is not None:
+                distance_matrix[:size, size:] = added
+                distance_matrix[size:, :size] = added.T
+            if np.sum(distance_matrix) == 0.0:
+                return float('inf')
+
+        def nbow(document):
+            d = np.zeros(len(words), dtype=np.double)
+            for word in document:
+                d[index[word]] += 1
+            return d / float(len(document))
+
+        if self._flavor == 'pot':
+            from ot import emd2
+            return emd2(nbow(document1), nbow(document2), distance_matrix)
+        from pyemd import emd
+        return emd(nbow(document1), nbow(document2), distance_matrix)
+
+
+class RelaxedWMDScorer(Scorer):
+    """Relaxed Word Mover's Distance, a tight lower bound of WMD that needs no transport problem solved.
+
+    Every word moves all of its weight to the nearest word of the other text and the larger of the
+    two directions is the distance (Kusner et al., 2015).  It uses the same word vectors as
+    wmdistance, normalized in gensim >= 4, so it never exceeds the WMD scorer's distance.  All
+    hypotheses of a source are scored with a few NumPy operations over one distance matrix.
+    """
+
+    def distances(self, source, hypotheses):
+        docs = [self._in_vocabulary(source)] + [self._in_vocabulary(hypothesis) for hypothesis in hypotheses]
+        if not docs[0]:
+            return [float('inf')] * len(hypotheses)
+        _, vectors, weights = self._bags(docs, normalized=True)
+        squares = (vectors ** 2).sum(axis=1)
+        matrix = np.sqrt(np.maximum(squares[:, None] + squares[None, :] - 2 * vectors.dot(vectors.T), 0))
+        source_words = np.flatnonzero(weights[0])
+        source_weights = weights[0, source_words]
+        hypothesis_weights = weights[1:]
+
+        # Source to hypothesis: each source word moves to its nearest word in the hypothesis
+        nearest = np.where(hypothesis_weights[:, None, :] > 0, matrix[source_words][None, :, :], np.inf).min(axis=2)
+        forward = nearest.dot(source_weights)
+        # Hypothesis to source: each hypothesis word moves to its nearest word in the source
+        backward = hypothesis_weights.dot(matrix[:, source_words].min(axis=1))
+        return [float(max(f, b)) if doc else float('inf') for f, b, doc in zip(forward, backward, docs[1:])]
+
+
+class CentroidScorer(Scorer):
+    """Cosine distance between the mean word vectors of the source and each hypothesis.
+
+    The cheapest scorer, all hypotheses of a source are scored with a single matrix product.
+    """
+
+    def distances(self, source, hypotheses):
+        docs = [self._in_vocabulary(source)] + [self._in_vocabulary(hypothesis) for hypothesis in hypotheses]
+        if not docs[0]:
+            return [float('inf')] * len(hypotheses)
+        _, vectors, weights = self._bags(docs)
+        centroids = weights.dot(vectors)
+        norms = np.linalg.norm(centroids, axis=1)
+        norms[norms == 0] = 1
+        cosines = centroids[1:].dot(centroids[0]) / (norms[1:] * norms[0])
+        return [max(0.0, float(1 - cosine)) if doc else float('inf') for cosine, doc in zip(cosines, docs[1:])]
+
+
+# Scorers that can be chosen by name
+scorers = {
+    'wmd': WMDScorer,
+    'rwmd': RelaxedWMDScorer,
+    'centroid': CentroidScorer,
+}
@@ -13,7 +13,10 @@ setup(
     license="BSD",
     packages=find_packages(),
     long_description=open("README.rst").read(),
-    install_requires=["gensim>=2.0", "language_check>=1.1", "pyemd>=0.4.4"],
+    install_requires=["gensim>=2.0", "language_check>=1.1", "numpy", "pyemd>=0.4.4"],
+    entry_points={
+        'console_scripts': ['pycontractions=pycontractions.cli:main'],
+    },
     classifiers=[
         'Development Status :: 5 - Production/Stable',
         'Environment :: Console',
@@ -0,0 +1,43 @@
+from __future__ import unicode_literals
+
+import asyncio
+import os
+import sys
+import unittest
+
+from gensim.models import KeyedVectors
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+from fixtures import VECTORS_PATH, StubLanguageTool, corpus  # noqa: E402
+
+from pycontractions import AsyncContractions, Contractions  # noqa: E402
+from pycontractions.instrumentation import Instrumentation  # noqa: E402
+
+
+class AsyncInstrumentationTest(unittest.TestCase):
+    """aexpand_texts counts and reports the same as expand_texts."""
+
+    def test_matches_expand_texts(self):
+        kv_model = KeyedVectors.load_word2vec_format(VECTORS_PATH, binary=False)
+        texts = corpus(20, 30, 0.1) + ["no contractions here"]
+        for precise in (False, True):
+            records, async_records = [], []
+            cont = Contractions(kv_model=kv_model, lc_tool=StubLanguageTool(),
+                                instrument=Instrumentation(records.append))
+            expected = list(cont.expand_texts(texts, precise=precise))
+            acont = AsyncContractions(kv_model=kv_model, lc_tool=StubLanguageTool(),
+                                      instrument=Instrumentation(async_records.append))
+
+            async def expand():
+                async with acont:
+                    return [text async for text in acont.aexpand_texts(texts, precise=precise, concurrency=4)]
+
+            self.assertEqual(asyncio.run(expand()), expected)
+            self.assertEqual(acont.instrumentation.counters, cont.instrumentation.counters)
+            self.assertGreater(acont.instrumentation.timers['grammar'], 0)
+            self.assertEqual([(r['length'], r['matches'], r['hypotheses'], r['rounds']) for r in async_records],
+                             [(r['length'], r['matches'], r['hypotheses'], r['rounds']) for r in records])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+from __future__ import unicode_literals
+
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from pycontractions import Contractions
+from pycontractions.cache import ScoreCache
+
+
+class StubModel(object):
+    vector_size = 16
+
+    def wmdistance(self, document1, document2):
+        raise NotImplementedError
+
+
+class ScoreCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='pycontractions-test-')
+        self.path = os.path.join(self.directory, 'scores.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_evicts_least_recently_used(self):
+        cache = ScoreCache(2)
+        cache.put(('a', 'a1'), (0.1, 0))
+        cache.put(('b', 'b1'), (0.2, 1))
+        self.assertEqual(cache.get(('a', 'a1')), (0.1, 0))
+        cache.put(('c', 'c1'), (0.3, 2))
+        self.assertIsNone(cache.get(('b', 'b1')))
+        self.assertEqual(cache.get(('c', 'c1')), (0.3, 2))
+        self.assertEqual(cache.stats(), {'hits': 2, 'misses': 1, 'size': 2, 'max_size': 2})
+
+    def test_save_and_load(self):
+        setup = {'scorer': 'wmd', 'model': 'vectors', 'lang_code': 'en-US'}
+        cache = ScoreCache(3)
+        for i in range(3):
+            cache.put(("source", "hypothesis {}".format(i)), (0.5 * i, i))
+        cache.get(("source", "hypothesis 0"))
+        cache.save(self.path, setup)
+
+        # Only the most recently used entries fit a smaller cache
+        loaded = ScoreCache(2)
+        loaded.load(self.path, setup)
+        self.assertEqual(list(loaded._entries.items()), list(cache._entries.items())[1:])
+        self.assertRaises(AttributeError, ScoreCache(3).load, self.path, dict(setup, model='other'))
+
+    def test_load_legacy_list(self):
+        with io.open(self.path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps([["source", "hypothesis", 0.5, 1]]))
+        cache = ScoreCache()
+        cache.load(self.path)
+        self.assertEqual(cache.get(("source", "hypothesis")), (0.5, 1))
+        # Without a saved setup there is no telling what the scores were computed with
+        setup = {'scorer': 'wmd', 'model': None, 'lang_code': 'en-US'}
+        self.assertRaises(AttributeError, ScoreCache().load, self.path, setup)
+
+    def test_contractions_check_setup(self):
+        cont = Contractions(kv_model=StubModel(), cache_size=10, cache_path=self.path, model_name='vectors')
+        cont.score_cache.put(("source", "hypothesis"), (0.5, 1))
+        cont.save_cache()
+        reloaded = Contractions(kv_model=StubModel(), cache_size=10, cache_path=self.path, model_name='vectors')
+        self.assertEqual(reloaded.score_cache.get(("source", "hypothesis")), (0.5, 1))
+        for options in ({'model_name': 'other'}, {'model_name': 'vectors', 'scorer': 'centroid'},
+                        {'model_name': 'vectors', 'lang_code': 'en-GB'}):
+            self.assertRaises(AttributeError, Contractions, kv_model=StubModel(), cache_size=10,
+                              cache_path=self.path, **options)
+
+
+if __name__ == '__main__':
+    unittest.main()
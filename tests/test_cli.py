@@ -0,0 +1,60 @@
+from __future__ import unicode_literals
+
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from pycontractions import cli
+
+
+class CliTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='pycontractions-test-')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def run_cli(self, argv, lines):
+        """Run the command line on an input file of lines and return its output lines."""
+        path = os.path.join(self.directory, 'input.txt')
+        with io.open(path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        output = os.path.join(self.directory, 'output.txt')
+        stdout = sys.stdout
+        # The command line writes to the file descriptor of stdout
+        with io.open(output, 'w', encoding='utf-8') as sys.stdout:
+            try:
+                cli.main(argv[:1] + [path, '--progress', '0'] + argv[1:])
+            finally:
+                sys.stdout = stdout
+        with io.open(output, encoding='utf-8') as f:
+            return f.read().splitlines()
+
+    def test_jsonl_keeps_blank_lines(self):
+        lines = [json.dumps({'id': 1, 'text': "I am here"}), "", "  ", json.dumps({'id': 2, 'text': "it is"})]
+        output = self.run_cli(['contract', '--jsonl'], lines)
+        self.assertEqual(len(output), len(lines))
+        self.assertEqual(json.loads(output[0]), {'id': 1, 'text': "I'm here"})
+        self.assertEqual(output[1:3], ["", ""])
+        self.assertEqual(json.loads(output[3]), {'id': 2, 'text': "it's"})
+
+    def test_unknown_scorer(self):
+        stderr = sys.stderr
+        sys.stderr = io.StringIO() if sys.version_info[0] > 2 else io.BytesIO()
+        try:
+            with self.assertRaises(SystemExit) as raised:
+                cli.main(['expand', '--scorer', 'nonsense'])
+            message = sys.stderr.getvalue()
+        finally:
+            sys.stderr = stderr
+        self.assertEqual(raised.exception.code, 2)
+        self.assertIn("Unknown scorer nonsense", message)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+from __future__ import unicode_literals
+
+import random
+import re
+import unittest
+
+from pycontractions import Contractions, apply_edits
+from pycontractions.contractions import _piece_edits, _split_contractions, _surface_forms, _tables
+
+# Endings that chain onto the replacement of another contraction, as in "we'll've" or "u'd"
+SUFFIXES = ["", "'d", "'ll", "'ve", "'re", "'s", "'t", "'m", "'d've", "'ll've"]
+SEPARATORS = [" ", "  ", ", ", ". ", "\n", "'", ""]
+
+
+def sequential_expand(text, choice):
+    """Expand text like the original loop of pattern.sub calls, picking options[choice] for contextual ones."""
+    for pattern, rep in _tables.simple_contractions.items():
+        text = pattern.sub(rep, text)
+    for pattern, options in _tables.contextual_contractions.items():
+        text = pattern.sub(options[choice], text)
+    return text
+
+
+def sequential_contract(text):
+    """Contract text like the original loop of pattern.sub calls."""
+    for pattern, rep in _tables.expansions.items():
+        text = pattern.sub(rep, text)
+    return text
+
+
+def single_pass_expand(text, choice):
+    """Expand text with _split_contractions, picking options[choice] for contextual ones."""
+    pieces, slots, spans = _split_contractions(text)
+    for pos, index in slots:
+        pieces[pos] = _tables.contextual_options[index][choice]
+    expanded = "".join(pieces)
+    if apply_edits(text, _piece_edits(pieces, spans, {})) != expanded:
+        raise AssertionError("Edits of {!r} don't rebuild {!r}".format(text, expanded))
+    return expanded
+
+
+def contraction_forms():
+    forms = set()
+    for pattern in list(_tables.simple_contractions) + list(_tables.contextual_contractions):
+        forms.update(_surface_forms(pattern))
+    return sorted(forms)
+
+
+def expansion_phrases():
+    return [re.sub(r"\\s\+", " ", pattern.pattern.replace(r"\b", "")) for pattern in _tables.expansions]
+
+
+def random_texts(words, count, seed):
+    rnd = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        parts = []
+        for _ in range(rnd.randint(1, 6)):
+            word = "".join(c.upper() if rnd.random() < 0.2 else c for c in rnd.choice(words))
+            parts.append(word + rnd.choice(SEPARATORS))
+        texts.append("".join(parts))
+    return texts
+
+
+class SinglePassTest(unittest.TestCase):
+    """The single pass matcher gives the same results as applying the patterns one after another."""
+
+    def assert_expands_like_sequential(self, texts):
+        for text in texts:
+            for choice in (0, -1):
+                self.assertEqual(single_pass_expand(text, choice), sequential_expand(text, choice), repr(text))
+
+    def assert_contracts_like_sequential(self, texts):
+        cont = Contractions()
+        for text, contracted, edits in zip(texts, cont.contract_texts(texts), cont.contract_texts(texts, edits=True)):
+            self.assertEqual(contracted, sequential_contract(text), repr(text))
+            self.assertEqual(apply_edits(text, edits), contracted, repr(text))
+
+    def test_chained_examples(self):
+        self.assertEqual(single_pass_expand("we'll've", 0), "we will have")
+        self.assertEqual(single_pass_expand("u'd", 0), "you had")
+        self.assertEqual(next(Contractions().contract_texts(["you would have"])), "you'd've")
+
+    def test_expand_surface_forms(self):
+        self.assert_expands_like_sequential([form + suffix for form in contraction_forms() for suffix in SUFFIXES])
+
+    def test_expand_random_texts(self):
+        forms = contraction_forms()
+        words = forms + [form + suffix for form in forms for suffix in SUFFIXES] + ["the", "so", "it", "you", "."]
+        self.assert_expands_like_sequential(random_texts(words, 3000, 0))
+
+    def test_contract_phrases(self):
+        phrases = expansion_phrases()
+        texts = list(phrases)
+        for phrase in phrases:
+            for other in phrases:
+                # Phrases sharing a word, as in "you would have"
+                first, _, rest = other.partition(" ")
+                if rest and phrase.split()[-1] == first:
+                    texts.append(phrase + " " + rest)
+                texts.append(phrase + " " + other)
+        self.assert_contracts_like_sequential(texts)
+
+    def test_contract_random_texts(self):
+        self.assert_contracts_like_sequential(random_texts(expansion_phrases() + ["the", "so", "have", "."], 3000, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
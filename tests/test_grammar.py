@@ -0,0 +1,61 @@
+from __future__ import unicode_literals
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+from fixtures import Match, StubLanguageTool  # noqa: E402
+
+from pycontractions import Contractions  # noqa: E402
+from pycontractions.contractions import _CROSS_PARAGRAPH_RULES, _count_errors, _join_paragraphs  # noqa: E402
+
+TEXTS = [
+    "🎉🎉🎉🎉 party time, it's here",
+    "café au lait and naïve résumé",
+    "",
+    "日本語 のテキスト 😀 then some words",
+    "𝒻𝒶𝓃𝒸𝓎 letters 𝒶𝓃𝒹 more",
+    "plain ascii text to end with",
+]
+
+
+class ParagraphRuleTool(StubLanguageTool):
+    """StubLanguageTool that also reports an error of a cross-paragraph rule at the start of every paragraph."""
+
+    def check(self, text):
+        matches = super(ParagraphRuleTool, self).check(text)
+        position = 0
+        for i, paragraph in enumerate(text.split("\n\n")):
+            match = Match(position)
+            match.ruleId = _CROSS_PARAGRAPH_RULES[i % len(_CROSS_PARAGRAPH_RULES)]
+            matches.append(match)
+            position += len(paragraph.encode('utf-16-le')) // 2 + 2
+        return matches
+
+
+class GrammarErrorsTest(unittest.TestCase):
+    """Errors of a batched LanguageTool request are attributed to the texts they were found in."""
+
+    def assert_counts_like_separate_checks(self, lc_tool, reference):
+        cont = Contractions(lc_tool=lc_tool)
+        for rate in (1, 2, 3):
+            lc_tool.rate = reference.rate = rate
+            self.assertEqual(cont._grammar_errors(TEXTS), [len(reference.check(text)) for text in TEXTS], rate)
+
+    def test_non_ascii_offsets(self):
+        self.assert_counts_like_separate_checks(StubLanguageTool(), StubLanguageTool())
+
+    def test_cross_paragraph_rules_ignored(self):
+        self.assert_counts_like_separate_checks(ParagraphRuleTool(), StubLanguageTool())
+
+    def test_count_errors(self):
+        document, starts, ends = _join_paragraphs(["ab", "😀", "c"])
+        self.assertEqual(document, "ab\n\n😀\n\nc")
+        self.assertEqual((starts, ends), ([0, 4, 8], [2, 6, 9]))
+        # Offsets on the separators belong to no text
+        self.assertEqual(_count_errors([0, 1, 2, 3, 4, 5, 6, 8], starts, ends), [2, 2, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+from __future__ import unicode_literals
+
+import unittest
+
+from pycontractions import Contractions
+from pycontractions.models import corpus_vocabulary
+from pycontractions.scorers import Scorer
+
+TEXTS = [
+    "Well, he's.",
+    "I'd,",
+    "end.he's here. She'd (he'd) go!",
+    "it's? They'd've... he's,she's \"you'd\" u'd",
+    "Who's there?It's me, and I'll say it's done.",
+]
+
+
+class RecordingScorer(Scorer):
+    """Scorer that records every token it is given."""
+
+    tokens = set()
+
+    def distances(self, source, hypotheses):
+        RecordingScorer.tokens.update(source)
+        for hypothesis in hypotheses:
+            RecordingScorer.tokens.update(hypothesis)
+        return [float(len(hypothesis)) for hypothesis in hypotheses]
+
+
+class StubModel(object):
+    def wmdistance(self, document1, document2):
+        raise NotImplementedError
+
+
+class StubLanguageTool(object):
+    def check(self, text):
+        return []
+
+
+class CorpusVocabularyTest(unittest.TestCase):
+
+    def test_punctuated_tokens(self):
+        self.assertTrue({"he's.", "is.", "has."} <= corpus_vocabulary(["Well, he's."]))
+        self.assertTrue({"I'd,", "would,", "had,"} <= corpus_vocabulary(["I'd,"]))
+
+    def test_covers_scored_tokens(self):
+        vocabulary = corpus_vocabulary(TEXTS)
+        cont = Contractions(kv_model=StubModel(), lc_tool=StubLanguageTool(), scorer=RecordingScorer)
+        for precise in (False, True):
+            for window in (None, 'sentence', 1):
+                RecordingScorer.tokens.clear()
+                list(cont.expand_texts(TEXTS, precise=precise, window=window))
+                self.assertTrue(RecordingScorer.tokens, (precise, window))
+                self.assertEqual(RecordingScorer.tokens - vocabulary, set(), (precise, window))
+
+
+if __name__ == '__main__':
+    unittest.main()
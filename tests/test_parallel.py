@@ -0,0 +1,45 @@
+from __future__ import unicode_literals
+
+import os
+import sys
+import unittest
+
+from gensim.models import KeyedVectors
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+from fixtures import VECTORS_PATH, StubLanguageTool, corpus  # noqa: E402
+
+from pycontractions import Contractions  # noqa: E402
+
+
+class ParallelTest(unittest.TestCase):
+    """Expanding across worker processes gives the results and cache of expanding in one process."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.kv_model = KeyedVectors.load_word2vec_format(VECTORS_PATH, binary=False)
+        cls.texts = corpus(40, 30, 0.1)
+
+    def contractions(self):
+        return Contractions(kv_model=self.kv_model, lc_tool=StubLanguageTool(), cache_size=10000)
+
+    def test_results_and_cache(self):
+        serial = self.contractions()
+        expected = list(serial.expand_texts(self.texts, window=3))
+        cont = self.contractions()
+        try:
+            self.assertEqual(list(cont.expand_texts(self.texts, window=3, workers=2, chunksize=4)), expected)
+            pool = cont._pool
+            self.assertEqual(list(cont.expand_texts(self.texts, precise=True, window=3, workers=2, chunksize=4)),
+                             list(serial.expand_texts(self.texts, precise=True, window=3)))
+            self.assertIs(cont._pool, pool)
+        finally:
+            cont.close()
+        self.assertIsNone(cont._pool)
+        self.assertEqual(dict(cont.score_cache._entries), dict(serial.score_cache._entries))
+        stats, expected_stats = cont.score_cache.stats(), serial.score_cache.stats()
+        self.assertEqual(stats['hits'] + stats['misses'], expected_stats['hits'] + expected_stats['misses'])
+
+
+if __name__ == '__main__':
+    unittest.main()
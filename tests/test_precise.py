@@ -0,0 +1,81 @@
+from __future__ import unicode_literals
+
+from itertools import combinations_with_replacement, permutations
+import os
+import sys
+import unittest
+
+from gensim.models import KeyedVectors
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+from fixtures import VECTORS_PATH, StubLanguageTool, corpus  # noqa: E402
+
+from pycontractions import Contractions, apply_edits  # noqa: E402
+from pycontractions.contractions import _split_contractions, _tables  # noqa: E402
+
+TEXTS = [
+    "I'd like to know how I'd done that!",
+    "He'd said he'd go if she'd come, and he'd be right.",
+    "It's late and it's cold, so I'd say it's time we'd left.",
+    "She's gone home. He's here and he's staying. She'd know.",
+]
+
+
+def exhaustive_expand(text, kv_model, lc_tool):
+    """Expand text with the permutation search that preceded the beam search.
+
+    Returns the expanded text, or None if the best hypothesis of any contraction ties with another.
+    """
+    for pattern, rep in _tables.simple_contractions.items():
+        text = pattern.sub(rep, text)
+    for pattern, options in _tables.contextual_contractions.items():
+        num_matches = len(pattern.findall(text))
+        if num_matches > 0:
+            hyp = []
+            for perm_set in (set(permutations(comb)) for comb in combinations_with_replacement(options, num_matches)):
+                for perm in perm_set:
+                    text1 = text
+                    for opt in perm:
+                        text1 = pattern.sub(opt, text1, count=1)
+                    hyp.append((text1, kv_model.wmdistance(text.split(), text1.split()), len(lc_tool.check(text1))))
+            hyp = sorted(hyp, key=lambda x: (x[2], x[1]))
+            if len(hyp) > 1 and hyp[0][0] != hyp[1][0] and hyp[0][1:] == hyp[1][1:]:
+                return None
+            text = hyp[0][0]
+    return text
+
+
+class PreciseTest(unittest.TestCase):
+    """The beam search of the precise method."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.kv_model = KeyedVectors.load_word2vec_format(VECTORS_PATH, binary=False)
+        # Short texts dense with contractions of several expansions, a few of which a beam of one gets wrong
+        cls.texts = TEXTS + corpus(40, 12, 0.3, phrases=["I'd", "he'd", "it's", "she's"])
+
+    def test_wide_beam_is_exhaustive(self):
+        lc_tool = StubLanguageTool()
+        cont = Contractions(kv_model=self.kv_model, lc_tool=lc_tool, beam_width=10000)
+        compared = 0
+        for text, expanded in zip(self.texts, cont.expand_texts(self.texts, precise=True)):
+            expected = exhaustive_expand(text, self.kv_model, lc_tool)
+            if expected is not None:
+                self.assertEqual(expanded, expected, repr(text))
+                compared += 1
+        self.assertGreater(compared, len(self.texts) // 2)
+
+    def test_narrow_beam_expands_every_occurrence(self):
+        cont = Contractions(kv_model=self.kv_model, lc_tool=StubLanguageTool(), beam_width=1)
+        for text, edits in zip(self.texts, cont.expand_texts(self.texts, precise=True, edits=True)):
+            _, slots, spans = _split_contractions(text)
+            self.assertEqual([(start, end) for start, end, _, _ in edits], spans, repr(text))
+            for pos, index in slots:
+                start, end, rep, score = edits[pos // 2]
+                self.assertIn(rep, _tables.contextual_options[index], repr(text))
+                self.assertIsNotNone(score)
+            self.assertEqual(apply_edits(text, edits), next(cont.expand_texts([text], precise=True)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+from __future__ import unicode_literals
+
+import os
+import random
+import sys
+import unittest
+
+from gensim.corpora import Dictionary
+from gensim.models import KeyedVectors
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+from fixtures import CONTRACTIONS, FILLER, VECTORS_PATH  # noqa: E402
+
+from pycontractions.scorers import RelaxedWMDScorer, WMDScorer  # noqa: E402
+
+# Tokens missing from the fixture model
+OOV = ["qwerty", "zxcv"]
+
+
+def documents(count, seed):
+    """Return count (source, hypotheses) cases of fixture words."""
+    rng = random.Random(seed)
+    words = FILLER[:40] + CONTRACTIONS + OOV
+    cases = []
+    for _ in range(count):
+        source = [rng.choice(words) for _ in range(rng.randint(1, 8))]
+        hypotheses = []
+        for _ in range(rng.randint(1, 4)):
+            hypothesis = list(source)
+            for i in rng.sample(range(len(hypothesis)), rng.randint(1, len(hypothesis))):
+                hypothesis[i] = rng.choice(words)
+            hypotheses.append(hypothesis)
+        cases.append((source, hypotheses))
+    return cases
+
+
+# Sources and hypotheses that hit the special cases of wmdistance: documents without any word in the
+# vocabulary, a single word between both documents and identical documents
+EDGE_CASES = [
+    ([], [["the"], []]),
+    (["qwerty"], [["the"], ["zxcv"]]),
+    (["the"], [[], ["qwerty"], ["the"], ["the", "the", "qwerty"], ["a"], ["the", "a"]]),
+    (["the", "the"], [["the"], ["a", "a"]]),
+    (["the", "qwerty", "a"], [["the", "a"], ["a", "the"], ["zxcv"]]),
+]
+
+
+class LegacyKeyedVectors(object):
+    """The fixture model behind the interface of gensim < 4 keyedvectors.
+
+    wmdistance is the pyemd based computation of gensim 3.8, on raw vectors and with the distance
+    matrix filled symmetrically.  "thee" has the vector of "the", so distances can be all zero.
+    """
+
+    def __init__(self, kv_model):
+        self.model = kv_model
+        self.index2word = list(kv_model.index_to_key) + ["thee"]
+
+    def __contains__(self, word):
+        return word == "thee" or word in self.model
+
+    def __getitem__(self, word):
+        return self.model.get_vector("the" if word == "thee" else word)
+
+    def wmdistance(self, document1, document2):
+        from pyemd import emd
+
+        document1 = [token for token in document1 if token in self]
+        document2 = [token for token in document2 if token in self]
+        if not document1 or not document2:
+            return float('inf')
+        dictionary = Dictionary(documents=[document1, document2])
+        vocab_len = len(dictionary)
+        if vocab_len == 1:
+            return 0.0
+        docset1 = set(document1)
+        docset2 = set(document2)
+        distance_matrix = np.zeros((vocab_len, vocab_len), dtype=np.double)
+        for i, t1 in dictionary.items():
+            if t1 not in docset1:
+                continue
+            for j, t2 in dictionary.items():
+                if t2 not in docset2 or distance_matrix[i, j] != 0.0:
+                    continue
+                distance_matrix[i, j] = distance_matrix[j, i] = np.sqrt(np.sum((self[t1] - self[t2]) ** 2))
+        if np.sum(distance_matrix) == 0.0:
+            return float('inf')
+
+        def nbow(document):
+            d = np.zeros(vocab_len, dtype=np.double)
+            for idx, freq in dictionary.doc2bow(document):
+                d[idx] = freq / float(len(document))
+            return d
+
+        return emd(nbow(document1), nbow(document2), distance_matrix)
+
+
+class ScorerTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.kv_model = KeyedVectors.load_word2vec_format(VECTORS_PATH, binary=False)
+
+    def assert_wmd_exact(self, kv_model, cases=()):
+        scorer = WMDScorer(kv_model)
+        for source, hypotheses in EDGE_CASES + list(cases) + documents(100, 1):
+            expected = [kv_model.wmdistance(source, hypothesis) for hypothesis in hypotheses]
+            distances = scorer.distances(source, hypotheses)
+            for hypothesis, distance, wmd in zip(hypotheses, distances, expected):
+                if wmd == float('inf'):
+                    self.assertEqual(distance, wmd, (source, hypothesis))
+                else:
+                    self.assertAlmostEqual(distance, wmd, 9, (source, hypothesis))
+
+    def test_wmd_exact(self):
+        self.assertEqual(WMDScorer(self.kv_model)._flavor, 'pot')
+        self.assert_wmd_exact(self.kv_model)
+
+    def test_wmd_exact_legacy(self):
+        legacy = LegacyKeyedVectors(self.kv_model)
+        self.assertEqual(WMDScorer(legacy)._flavor, 'pyemd')
+        self.assert_wmd_exact(legacy, [(["the"], [["thee"], ["thee", "the"], ["a", "thee"]])])
+
+    def test_rwmd_lower_bound(self):
+        scorer = RelaxedWMDScorer(self.kv_model)
+        for source, hypotheses in documents(50, 0):
+            for hypothesis, distance in zip(hypotheses, scorer.distances(source, hypotheses)):
+                self.assertLessEqual(distance, self.kv_model.wmdistance(source, hypothesis) + 1e-6,
+                                     (source, hypothesis))
+
+
+if __name__ == '__main__':
+    unittest.main()